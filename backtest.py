@@ -0,0 +1,199 @@
+# --- BACKTEST: REPLAY PAST DRAFTS AND CHECK THE PICK MODEL AGAINST THE REAL PICKS ---
+#
+# Boards are rebuilt from draft_history: every player drafted that year, in round order.
+# The history has no pick order inside a round, so the 2025 order of each round is used.
+# Profiles are derived from the same history, so hit rates are in-sample.
+# Usage: python backtest.py [--years 2022 2023 2024] [--min-top4 0.3]
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from draft_engine import (
+    HISTORY_PICK_TYPES, load_data, build_score_matrices, compact_pool, compile_rules, compile_draft_plan, normalize_name,
+    safe_float, new_draft_state, pick_plan, rank_candidates, record_pick, slot_info
+)
+from pick_probabilities import stage_probabilities
+from shared_data import SharedDraftData, attach_data
+
+POSITIONS = ["QB", "RB", "WR", "TE"]
+PICK_TYPES = ["Freshman", "Upside", "RTC"]
+
+def history_years(data):
+    return sorted({y for p in data.manager_profiles.values() for y in p.get("draft_history", {})})
+
+def history_board(data, year):
+    """DraftData for one past season: its pool is every player drafted that year and its
+    draft order has one slot per real pick. Also returns the real pick (pool row) per slot."""
+    by_round = {}
+    for manager, profile in data.manager_profiles.items():
+        for rnd, pick in profile.get("draft_history", {}).get(year, {}).items():
+            by_round.setdefault(int(float(rnd)), {})[manager] = pick
+    order_2025 = [normalize_name(m) for m in data.draft_order["Manager"]]
+    slots, players = [], []
+    for rnd in sorted(by_round):
+        picks = by_round[rnd]
+        in_round = [m for m, r in zip(order_2025, data.draft_order["Round"]) if r == rnd and m in picks]
+        in_round += sorted(m for m in picks if m not in in_round)
+        for manager in dict.fromkeys(in_round):
+            pick = picks[manager]
+            slots.append({"Round": rnd, "Manager": manager})
+            players.append({
+                "NormPlayer": normalize_name(pick.get("Player")),
+                "Player": pick.get("Player"),
+                "College": pick.get("College"),
+                # draft_history and the profile college weights share the short college codes
+                "NormCollege": str(pick.get("College") or "").strip().upper(),
+                "Position": pick.get("Position"),
+                "ADP": np.nan,
+                "Stars": safe_float(pick.get("Stars")),
+                "Rating": safe_float(pick.get("Rating")),
+                "PickType": HISTORY_PICK_TYPES.get(pick.get("PickType"), pick.get("PickType")),
+            })
+    draft_order = pd.DataFrame(slots, columns=["Round", "Manager"])
+    draft_order["Overall Pick"] = range(1, len(draft_order) + 1)
+    pool = compact_pool(pd.DataFrame(players).drop_duplicates("NormPlayer"))
+    player_index = {p: i for i, p in enumerate(pool["NormPlayer"])}
+    actual = [player_index[p["NormPlayer"]] for p in players]
+    score_rows, scores, consensus_scores = build_score_matrices(pool, data.compiled_profiles, data.params)
+    board = data._replace(
+        draft_order=draft_order, pool=pool, player_index=player_index,
+        score_rows=score_rows, scores=scores, consensus_scores=consensus_scores,
+        rules=compile_rules(data.rules.table, pool), plan=compile_draft_plan(draft_order, score_rows)
+    )
+    return board, actual
+
+def model_choice(plan, available):
+    """The model's pick: the top-scored available candidate of the most likely stage. The
+    replay knows exactly who is left, so that is the first stage with a candidate on the
+    board. The draw itself is uniform over a top-n window, so the pick probabilities tie
+    and cannot name a single choice."""
+    for branch, candidates, _ in plan["stages"]:
+        score = plan.get("stage_scores", {}).get(branch, plan["score"])
+        order = rank_candidates(candidates, score)
+        order = order[available[order]]
+        if len(order):
+            return int(order[0])
+    return None
+
+def backtest_manager(board, actual, manager):
+    """Replay the real picks and evaluate the model at each of manager's slots"""
+    state = new_draft_state(board)
+    position_confusion = np.zeros((len(POSITIONS), len(POSITIONS)), dtype=int)
+    picktype_confusion = np.zeros((len(PICK_TYPES), len(PICK_TYPES)), dtype=int)
+    picks = top1 = top4 = 0
+    prob_actual = 0.0
+    for idx, row_pos in enumerate(actual):
+        slot_manager, round_num, overall_pick = slot_info(board.plan, idx)
+        row = board.pool.iloc[row_pos]
+        if slot_manager == manager:
+            plan = pick_plan(board, state, idx)
+            probs = stage_probabilities(plan, state.available.astype(float)) if plan["stages"] else np.zeros(len(board.pool))
+            picks += 1
+            prob_actual += probs[row_pos]
+            top4 += int(probs[row_pos] > 0 and probs[row_pos] >= np.sort(probs)[-4])
+            choice = model_choice(plan, state.available)
+            if choice is not None:
+                top1 += int(choice == row_pos)
+                predicted = board.pool.iloc[choice]
+                if predicted["Position"] in POSITIONS and row["Position"] in POSITIONS:
+                    position_confusion[POSITIONS.index(row["Position"]), POSITIONS.index(predicted["Position"])] += 1
+                if predicted["PickType"] in PICK_TYPES and row["PickType"] in PICK_TYPES:
+                    picktype_confusion[PICK_TYPES.index(row["PickType"]), PICK_TYPES.index(predicted["PickType"])] += 1
+        record_pick(board, state, slot_manager, round_num, overall_pick, row, "")
+        state.current_pick_idx += 1
+        state.pick_number += 1
+    return {
+        "manager": manager, "picks": picks, "top1": top1, "top4": top4, "prob_actual": prob_actual,
+        "position_confusion": position_confusion.tolist(), "picktype_confusion": picktype_confusion.tolist(),
+    }
+
+# --- WORKERS: data is attached once per process, season boards are built once per process ---
+_worker_data = None
+_worker_boards = {}
+
+def _init_worker(handle):
+    global _worker_data
+    _worker_data = attach_data(handle)
+
+def _backtest_task(year, managers):
+    if year not in _worker_boards:
+        _worker_boards[year] = history_board(_worker_data, year)
+    board, actual = _worker_boards[year]
+    return [dict(backtest_manager(board, actual, m), year=year) for m in managers]
+
+def run_backtest(base_dir=".", years=None, workers=None):
+    """One result dict per (year, manager), evaluated in parallel across seasons and managers"""
+    data = load_data(base_dir)
+    years = [str(y) for y in (years or history_years(data))]
+    tasks = []
+    for year in years:
+        managers = sorted(m for m, p in data.manager_profiles.items() if p.get("draft_history", {}).get(year))
+        tasks.append((year, managers))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        global _worker_data
+        _worker_data = data
+        return [r for year, managers in tasks for r in _backtest_task(year, managers)]
+    # Split each season across the workers; every worker builds a season board only once
+    jobs = [(year, managers[i::workers]) for year, managers in tasks for i in range(min(workers, len(managers)))]
+    with SharedDraftData(data) as shared, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.handle,)) as pool:
+        futures = [pool.submit(_backtest_task, year, managers) for year, managers in jobs]
+        return sorted((r for f in futures for r in f.result()), key=lambda r: (r["year"], r["manager"]))
+
+def summarize(results):
+    """Totals over a list of result dicts"""
+    picks = sum(r["picks"] for r in results)
+    return {
+        "picks": picks,
+        "top1": sum(r["top1"] for r in results) / max(picks, 1),
+        "top4": sum(r["top4"] for r in results) / max(picks, 1),
+        "prob_actual": sum(r["prob_actual"] for r in results) / max(picks, 1),
+        "position_confusion": np.sum([r["position_confusion"] for r in results], axis=0).tolist(),
+        "picktype_confusion": np.sum([r["picktype_confusion"] for r in results], axis=0).tolist(),
+    }
+
+def print_report(results):
+    table = pd.DataFrame([
+        {"Year": r["year"], "Manager": r["manager"], "Picks": r["picks"],
+         "Top-1": r["top1"] / max(r["picks"], 1), "Top-4": r["top4"] / max(r["picks"], 1),
+         "P(actual)": r["prob_actual"] / max(r["picks"], 1)}
+        for r in results
+    ])
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.float_format", "{:.3f}".format):
+        print(table.to_string(index=False))
+        for year in sorted({r["year"] for r in results}):
+            s = summarize([r for r in results if r["year"] == year])
+            print(f"{year}: top-1 {s['top1']:.3f}  top-4 {s['top4']:.3f}  P(actual) {s['prob_actual']:.3f}  ({s['picks']} picks)")
+        total = summarize(results)
+        print(f"All: top-1 {total['top1']:.3f}  top-4 {total['top4']:.3f}  P(actual) {total['prob_actual']:.3f}  ({total['picks']} picks)")
+        print("\nPosition confusion (rows = actual, columns = model's top pick):")
+        print(pd.DataFrame(total["position_confusion"], index=POSITIONS, columns=POSITIONS).to_string())
+        print("\nPick type confusion (rows = actual, columns = model's top pick):")
+        print(pd.DataFrame(total["picktype_confusion"], index=PICK_TYPES, columns=PICK_TYPES).to_string())
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the pick model on the drafts in draft_history.")
+    parser.add_argument("--years", nargs="*", default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--min-top4", type=float, default=None, help="exit with status 1 if the overall top-4 rate is lower")
+    parser.add_argument("--out", default=None, help="write per manager and year results as JSON")
+    args = parser.parse_args()
+
+    results = run_backtest(args.base_dir, args.years, args.workers)
+    total = print_report(results)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"summary": total, "results": results}, f, indent=2, default=float)
+    if args.min_top4 is not None and total["top4"] < args.min_top4:
+        print(f"Top-4 rate {total['top4']:.3f} is below {args.min_top4:.3f}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
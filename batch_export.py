@@ -0,0 +1,163 @@
+# --- BATCH EXPORT: THOUSANDS OF SIMULATED DRAFTS STREAMED TO PARQUET OR GZIP CSV ---
+#
+# One row per pick: sim_id, overall_pick, round, manager, player_id (pool PlayerId, -1 for
+# skipped/empty picks), branch (the pick-rule stage that produced it) and score.
+# Workers return compact column arrays per chunk of drafts; the writer buffers at most
+# chunk_rows rows before flushing, so memory stays bounded however many drafts are run.
+# Usage: python batch_export.py --sims 10000 --out sims --format parquet
+
+import argparse
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+from draft_engine import load_data
+from shared_data import SharedDraftData, attach_data
+from sim_results import branch_names, simulate_results
+
+COLUMNS = {
+    "sim_id": np.int32, "overall_pick": np.int16, "round": np.int8, "manager": np.int16,
+    "player_id": np.int32, "branch": np.int8, "score": np.float32,
+}
+
+def manager_names(data):
+    return data.plan.managers
+
+def simulate_columns(data, sim_ids, seed=0):
+    """Pick columns for one full draft per sim id; manager and branch are integer codes
+    into manager_names() / branch_names() (-1 when there is none)"""
+    results = simulate_results(data, [seed + sim_id for sim_id in sim_ids], keep_scores=True)
+    plan = data.plan
+    n_sims = len(sim_ids)
+    return {
+        "sim_id": np.repeat(np.asarray(sim_ids, dtype=COLUMNS["sim_id"]), len(plan.manager_ids)),
+        "overall_pick": np.tile(plan.overall_picks, n_sims).astype(COLUMNS["overall_pick"]),
+        "round": np.tile(plan.rounds, n_sims).astype(COLUMNS["round"]),
+        "manager": np.tile(results.managers, n_sims).astype(COLUMNS["manager"]),
+        "player_id": results.players.ravel().astype(COLUMNS["player_id"]),
+        "branch": results.branches.ravel(),
+        "score": results.scores.ravel(),
+    }
+
+class PickWriter:
+    """Buffers pick columns and flushes them every chunk_rows rows.
+
+    parquet: path is a directory of part-NNNNN.parquet files (one per flush), readable
+    as one dataset with pd.read_parquet(path). csv: path is a single .csv.gz stream.
+    Manager and branch codes are decoded to labels at flush time.
+    """
+
+    def __init__(self, path, managers, branches, fmt="parquet", chunk_rows=1_000_000):
+        if fmt not in ("parquet", "csv"):
+            raise ValueError(f"Unknown export format: {fmt}")
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401  (pandas needs it to write parquet)
+            except ImportError:
+                raise ImportError("Parquet export needs pyarrow (pip install pyarrow); use --format csv otherwise.")
+            os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.fmt = fmt
+        self.chunk_rows = chunk_rows
+        self.managers = managers
+        self.branches = branches
+        self.rows = 0
+        self.parts = 0
+        self._buffer = []
+        self._buffered = 0
+        self._csv = gzip.open(path, "wt", newline="") if fmt == "csv" else None
+
+    def write(self, cols):
+        self._buffer.append(cols)
+        self._buffered += len(cols["sim_id"])
+        if self._buffered >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        cols = {name: np.concatenate([c[name] for c in self._buffer]) for name in COLUMNS}
+        self._buffer, self._buffered = [], 0
+        frame = pd.DataFrame(cols)
+        frame["manager"] = pd.Categorical.from_codes(cols["manager"], self.managers)
+        frame["branch"] = pd.Categorical.from_codes(cols["branch"], self.branches)
+        if self.fmt == "parquet":
+            frame.to_parquet(os.path.join(self.path, f"part-{self.parts:05d}.parquet"), index=False)
+        else:
+            frame.to_csv(self._csv, header=self.rows == 0, index=False)
+        self.rows += len(frame)
+        self.parts += 1
+
+    def close(self):
+        self.flush()
+        if self._csv is not None:
+            self._csv.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- WORKERS: every process attaches to the data the parent published ---
+_worker_data = None
+
+def _init_worker(handle):
+    global _worker_data
+    _worker_data = attach_data(handle)
+
+def _simulate_chunk(sim_ids, seed):
+    return simulate_columns(_worker_data, sim_ids, seed)
+
+def export_batch(out, n_sims, fmt="parquet", base_dir=".", workers=None, chunk_sims=50, chunk_rows=1_000_000, seed=0, progress=None):
+    """Simulate n_sims drafts on a process pool and stream every pick to out.
+
+    At most two chunks per worker are in flight, so finished results never pile up in
+    memory while the writer catches up. Returns the number of rows written.
+    """
+    data = load_data(base_dir)
+    chunks = [list(range(i, min(i + chunk_sims, n_sims))) for i in range(0, n_sims, chunk_sims)]
+    workers = workers or os.cpu_count() or 1
+    with PickWriter(out, manager_names(data), branch_names(data), fmt, chunk_rows) as writer, \
+            SharedDraftData(data) as shared, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.handle,)) as pool:
+        pending = set()
+        next_chunk = 0
+        done_sims = 0
+        while next_chunk < len(chunks) or pending:
+            while next_chunk < len(chunks) and len(pending) < 2 * workers:
+                pending.add(pool.submit(_simulate_chunk, chunks[next_chunk], seed))
+                next_chunk += 1
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                cols = future.result()
+                writer.write(cols)
+                done_sims += len(np.unique(cols["sim_id"]))
+                if progress is not None:
+                    progress(done_sims, n_sims)
+    return writer.rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many drafts and stream every pick to disk.")
+    parser.add_argument("--sims", type=int, default=1000)
+    parser.add_argument("--out", default="sim_picks")
+    parser.add_argument("--format", choices=["parquet", "csv"], default="parquet")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-sims", type=int, default=50, help="drafts per worker task")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000, help="rows buffered before each flush")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-dir", default=".")
+    args = parser.parse_args()
+
+    out = args.out
+    if args.format == "csv" and not out.endswith(".csv.gz"):
+        out += ".csv.gz"
+    rows = export_batch(
+        out, args.sims, args.format, args.base_dir, args.workers, args.chunk_sims, args.chunk_rows, args.seed,
+        progress=lambda done, total: print(f"\r{done}/{total} drafts", end="", flush=True)
+    )
+    print(f"\nWrote {rows} picks to {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+# --- CALIBRATION: PARALLEL SEARCH OVER THE SCORING PARAMETERS ---
+#
+# Each candidate ScoringParams is scored by how likely the managers' real draft_history
+# (pick type and position by round) is under the pick mix of simulated 2025 drafts.
+# Usage: python calibration.py --search random --trials 32 --drafts 200
+
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from draft_engine import (
+    DEFAULT_PARAMS, HISTORY_PICK_TYPES, ScoringParams, load_data, with_params
+)
+from shared_data import SharedDraftData, attach_data
+from sim_results import lookup, simulate_results
+
+PICK_TYPES = ["Freshman", "Upside", "RTC"]
+POSITIONS = ["QB", "RB", "WR", "TE"]
+CATEGORIES = {(t, p): i for i, (t, p) in enumerate(itertools.product(PICK_TYPES, POSITIONS))}
+
+# (low, high) per parameter for random and adaptive search; ints stay ints
+DEFAULT_SPACE = {
+    "rating": (0.5, 1.5),
+    "stars": (0.4, 1.2),
+    "pos_bias": (0.0, 0.2),
+    "college_bias": (0.0, 0.03),
+    "adp": (0.0, 0.06),
+    "qb_boost": (0.0, 0.4),
+    "te_boost": (0.0, 0.4),
+    "top_n": (2, 6),
+    "force_te_round": (4, 9),
+}
+
+def category_of(pick_type, position):
+    return CATEGORIES.get((HISTORY_PICK_TYPES.get(pick_type, pick_type), position))
+
+def history_counts(data):
+    """Observed picks per [manager row, round - 1, category], over every year of draft_history"""
+    n_rounds = int(data.plan.rounds.max())
+    counts = np.zeros((len(data.score_rows), n_rounds, len(CATEGORIES)))
+    for manager, row in data.score_rows.items():
+        history = data.manager_profiles.get(manager, {}).get("draft_history", {})
+        for year, rounds in history.items():
+            for rnd, pick in rounds.items():
+                r = int(float(rnd)) - 1
+                cat = category_of(pick.get("PickType"), pick.get("Position"))
+                if 0 <= r < n_rounds and cat is not None:
+                    counts[row, r, cat] += 1
+    return counts
+
+def category_table(data):
+    """CATEGORIES code of every pool row (-1 for pick types and positions outside them)"""
+    cats = [category_of(t, p) for t, p in zip(data.pool["PickType"].astype(object), data.pool["Position"].astype(object))]
+    return np.array([-1 if c is None else c for c in cats], dtype=np.int8)
+
+def simulated_counts(data, seeds):
+    """Pick counts per [manager row, round - 1, category] over one full draft per seed"""
+    results = simulate_results(data, list(seeds))
+    n_rounds = int(data.plan.rounds.max())
+    cats = lookup(results, category_table(data))
+    cells = (results.managers.astype(np.int64) * n_rounds + results.rounds - 1) * len(CATEGORIES) + cats
+    cells = cells[(cats >= 0) & (results.managers >= 0)]
+    size = len(data.score_rows) * n_rounds * len(CATEGORIES)
+    return np.bincount(cells, minlength=size).reshape(len(data.score_rows), n_rounds, len(CATEGORIES)).astype(float)
+
+def history_loss(sim_counts, hist_counts, alpha=0.5):
+    """Mean negative log-likelihood of the real picks under the smoothed simulated pick mix"""
+    probs = (sim_counts + alpha) / (sim_counts + alpha).sum(axis=2, keepdims=True)
+    return float(-(hist_counts * np.log(probs)).sum() / max(hist_counts.sum(), 1))
+
+# --- WORKERS: every process attaches to the data the parent published and keeps it ---
+_worker_data = None
+
+def _init_worker(handle):
+    global _worker_data
+    _worker_data = attach_data(handle)
+
+def _evaluate_chunk(params, seeds):
+    data = _worker_data if params == _worker_data.params else with_params(_worker_data, params)
+    return simulated_counts(data, seeds)
+
+class Evaluator:
+    """Scores batches of ScoringParams on a process pool.
+
+    Every candidate is simulated on the same seeds (common random numbers), so the
+    difference between two candidates is not swamped by draft-to-draft noise.
+    """
+
+    def __init__(self, base_dir=".", n_drafts=200, workers=None, chunk_size=25, seed=0):
+        self.base_dir = base_dir
+        self.seeds = list(range(seed, seed + n_drafts))
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count() or 1
+        self.data = load_data(base_dir)
+        self.hist = history_counts(self.data)
+        self.shared = SharedDraftData(self.data)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.shared.handle,))
+
+    def evaluate(self, candidates):
+        """Loss of every candidate, in order (lower is better)"""
+        chunks = [self.seeds[i:i + self.chunk_size] for i in range(0, len(self.seeds), self.chunk_size)]
+        futures = [[self.pool.submit(_evaluate_chunk, params, chunk) for chunk in chunks] for params in candidates]
+        return [history_loss(sum(f.result() for f in group), self.hist) for group in futures]
+
+    def close(self):
+        self.pool.shutdown()
+        self.shared.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# --- SEARCH STRATEGIES ---
+def _cast(name, value):
+    return int(round(value)) if isinstance(getattr(DEFAULT_PARAMS, name), int) else float(value)
+
+def grid_candidates(grid, base=DEFAULT_PARAMS):
+    """Every combination of grid = {name: [values]} on top of base"""
+    names = list(grid)
+    return [base._replace(**{n: _cast(n, v) for n, v in zip(names, values)}) for values in itertools.product(*grid.values())]
+
+def random_candidates(space, n, rng, base=DEFAULT_PARAMS):
+    """n candidates drawn uniformly from space = {name: (low, high)}"""
+    return [base._replace(**{name: _cast(name, rng.uniform(low, high)) for name, (low, high) in space.items()}) for _ in range(n)]
+
+def run_search(evaluator, candidates):
+    """Evaluate candidates and return [(loss, params)] best first"""
+    return sorted(zip(evaluator.evaluate(candidates), candidates), key=lambda r: r[0])
+
+def adaptive_search(evaluator, space, generations, population, rng, base=DEFAULT_PARAMS, shrink=0.6):
+    """(1 + population) local search: perturb the incumbent within a radius that shrinks
+    whenever a generation brings no improvement. Returns [(loss, params)] best first."""
+    incumbent = base
+    best_loss = evaluator.evaluate([incumbent])[0]
+    history = [(best_loss, incumbent)]
+    radius = 0.5
+    for _ in range(generations):
+        candidates = []
+        for _ in range(population):
+            values = {}
+            for name, (low, high) in space.items():
+                step = rng.normal(0.0, radius * (high - low) / 2)
+                values[name] = _cast(name, min(max(getattr(incumbent, name) + step, low), high))
+            candidates.append(incumbent._replace(**values))
+        results = run_search(evaluator, candidates)
+        history.extend(results)
+        if results[0][0] < best_loss:
+            best_loss, incumbent = results[0]
+        else:
+            radius *= shrink
+    return sorted(history, key=lambda r: r[0])
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate the draft_pick scoring parameters against draft_history.")
+    parser.add_argument("--search", choices=["grid", "random", "adaptive"], default="random")
+    parser.add_argument("--trials", type=int, default=16, help="random: candidates; adaptive: generations")
+    parser.add_argument("--population", type=int, default=8, help="adaptive: candidates per generation")
+    parser.add_argument("--grid", default="adp=0.01,0.03,0.05;stars=0.6,0.8,1.0", help="grid: name=v1,v2;name=v1,v2")
+    parser.add_argument("--drafts", type=int, default=200, help="simulated drafts per candidate")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--out", default=None, help="write all results as JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    with Evaluator(args.base_dir, args.drafts, args.workers, seed=args.seed) as evaluator:
+        if args.search == "grid":
+            grid = {}
+            for part in args.grid.split(";"):
+                name, values = part.split("=")
+                grid[name.strip()] = [float(v) for v in values.split(",")]
+            results = run_search(evaluator, grid_candidates(grid))
+        elif args.search == "random":
+            results = run_search(evaluator, [DEFAULT_PARAMS] + random_candidates(DEFAULT_SPACE, args.trials, rng))
+        else:
+            results = adaptive_search(evaluator, DEFAULT_SPACE, args.trials, args.population, rng)
+        baseline = evaluator.evaluate([DEFAULT_PARAMS])[0]
+
+    print(f"Default parameters: loss {baseline:.4f}")
+    for loss, params in results[:5]:
+        print(f"{loss:.4f}  {dict(params._asdict())}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"baseline": baseline, "results": [{"loss": l, "params": p._asdict()} for l, p in results]}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
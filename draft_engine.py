@@ -0,0 +1,1444 @@
+# --- DRAFT ENGINE: DATA LOADING AND PICK LOGIC SHARED BY EVERY SESSION ---
+
+import pandas as pd
+import numpy as np
+import json
+import hashlib
+import logging
+import unicodedata
+import re
+import random
+import os
+from dataclasses import dataclass, field
+from typing import NamedTuple
+from collections import deque
+from player_matching import file_hash, match_sources
+
+log = logging.getLogger(__name__)
+# One DEBUG record per explained pick with the decision in record.pick (see trace_pick)
+pick_log = logging.getLogger(f"{__name__}.picks")
+
+#-------- CONFIGURATION ---------
+DRAFT_ORDER_FILE = "2025 DRAFT ORDER.csv"
+ADP_FILE = "2025 ADP DATA.csv"
+FRESHMAN_FILE = "2025 247 FRESHMAN RANK.csv"
+PROFILES_FILE = "manager_profiles_advanced.json"
+PICK_RULES_FILE = "pick_rules.json"
+# Canonical player ids across the ranking files; rebuilt for a file only when it changes
+PLAYER_IDS_FILE = "player_ids.csv"
+# draft_history spells the pick types out; the pool uses the short labels
+HISTORY_PICK_TYPES = {"Ready to Contribute": "RTC", "RTC": "RTC", "Upside": "Upside", "Freshman": "Freshman"}
+
+CONSENSUS_ELITE_ORDER = [
+    "BRYCE UNDERWOOD", "DAKORIEN MOORE", "KEELON RUSSELL"
+]
+CONSENSUS_ELITE_SET = set(CONSENSUS_ELITE_ORDER + [
+    "TAVIEN ST. CLAIR", "WAYMOND JORDAN", "HARLEM BERRY",
+    "KALIQ LOCKETT", "JEROME MYLES", "QUINCY PORTER", "VERNELL BROWN III", "ELYISS WILLIAMS", "TALYN TAYLOR"
+])
+UPSIDE_ELIGIBLE_COLLEGES = {
+    "ALABAMA", "OHIO STATE", "LSU", "GEORGIA", "USC", "OKLAHOMA", "TEXAS", "FLORIDA",
+    "MICHIGAN", "OREGON", "FLORIDA STATE", "WASHINGTON", "NOTRE DAME", "TENNESSEE",
+    "TEXAS A&M", "OLE MISS", "MIAMI (FL)", "PENN STATE", "SOUTH CAROLINA", "ILLINOIS",
+    "MISSOURI", "COLORADO", "IOWA", "ARIZONA STATE", "IOWA STATE"
+}
+RTC_ELIGIBLE_COLLEGES = {
+    "UMASS", "NEW MEXICO", "AKRON", "FIU", "BOWLING GREEN", "KENT STATE", "BALL STATE",
+    "EASTERN MICHIGAN", "BUFFALO", "NORTHERN ILLINOIS", "OLD DOMINION", "TEXAS STATE",
+    "SOUTH ALABAMA", "UTEP", "LOUISIANA-MONROE", "CHARLOTTE", "NEVADA", "GEORGIA SOUTHERN",
+    "SOUTHERN MISS", "ARKANSAS STATE", "SAN JOSE STATE", "HAWAII", "LOUISIANA TECH",
+    "MIDDLE TENNESSEE", "WESTERN MICHIGAN", "CENTRAL MICHIGAN", "RICE", "NAVY", "ARMY",
+    "AIR FORCE", "COASTAL CAROLINA", "GEORGIA STATE", "TROY", "UTSA",
+    "NORTH TEXAS", "APPALACHIAN STATE", "TEMPLE", "EAST CAROLINA", "TULSA",
+    "FLORIDA ATLANTIC", "LIBERTY", "SOUTH FLORIDA", "WYOMING", "UNLV",
+    "UTAH STATE", "BOISE STATE", "FRESNO STATE", "SAN DIEGO STATE", "COLORADO STATE",
+    "WESTERN KENTUCKY", "MARSHALL", "CONNECTICUT"
+}
+
+def normalize_name(name):
+    if not isinstance(name, str):
+        return ""
+    name = name.upper()
+    name = ''.join(c for c in unicodedata.normalize('NFD', name) if unicodedata.category(c) != 'Mn')
+    name = re.sub(r'\b(JR|SR|II|III|IV|V)\b', '', name)
+    name = re.sub(r'[^A-Z0-9 ]', '', name)
+    name = re.sub(r'\s+', ' ', name)
+    return name.strip()
+
+def normalize_college(col):
+    if not isinstance(col, str):
+        return ""
+    col = col.strip().upper().replace("'", "")
+    col = col.replace("MIAMI FL", "MIAMI (FL)").replace("TEXAS AM", "TEXAS A&M")
+    col = col.replace("OKST", "OKLAHOMA STATE").replace("OREG", "OREGON")
+    col = col.replace("OREST", "OREGON STATE").replace("SOAL", "SOUTH ALABAMA")
+    col = col.replace("FRES", "FRESNO STATE").replace("GA ST", "GEORGIA STATE")
+    return col
+
+def safe_float(x):
+    try:
+        return float(x)
+    except Exception:
+        return None
+
+def numeric_column(column):
+    """Float64 values of a pool column (NaN when missing), whatever its storage dtype"""
+    values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return pd.Series(values, index=column.index)
+
+def map_weights(column, weights):
+    """weights.get(value, 0) for every row; categorical columns look up each category once"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        table = np.array([weights.get(c, 0) for c in column.cat.categories] + [0], dtype=np.float64)
+        return pd.Series(np.nan_to_num(table)[column.cat.codes.to_numpy()], index=column.index)
+    return column.map(lambda v: weights.get(v, 0)).fillna(0).astype(np.float64)
+
+def has_position(column):
+    """Rows with a usable Position (a non-empty string)"""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.notna() & (column != "")
+    return column.map(lambda p: isinstance(p, str) and p != "").astype(bool)
+
+def ensure_columns(df, cols):
+    for col in cols:
+        if col not in df.columns:
+            df.loc[:, col] = None
+    return df
+
+def is_5star_freshman(row):
+    try:
+        if row["PickType"] == "Freshman":
+            return (safe_float(row.get("Stars")) or 0) >= 5.0 or (safe_float(row.get("Rating")) or 0) >= 0.99
+        return False
+    except Exception:
+        return False
+
+def is_5star_freshman_mask(frame):
+    """Vectorized is_5star_freshman() over a pool slice"""
+    stars = numeric_column(frame["Stars"])
+    rating = numeric_column(frame["Rating"])
+    return (frame["PickType"] == "Freshman") & ((stars >= 5.0) | (rating >= 0.99))
+
+def is_consensus_elite(player_name):
+    return normalize_name(player_name) in CONSENSUS_ELITE_SET
+
+def eligible_for_upside(row):
+    return normalize_college(row["College"]) in UPSIDE_ELIGIBLE_COLLEGES
+
+def eligible_for_rtc(row):
+    return normalize_college(row["College"]) in RTC_ELIGIBLE_COLLEGES
+
+def is_5star_skipper(profile):
+    leaks = profile.get("freshman_value_leaks", [])
+    return len(leaks) > 0
+
+
+def can_draft(manager, row, round_num, ledger):
+    pos = row["Position"]
+    roster = ledger.roster(manager)
+    if not pos or not isinstance(pos, str):
+        return False
+    if pos == "TE" and roster["TE"] >= 2:
+        return False
+    if pos == "QB" and roster["QB"] >= 5:
+        return False
+    if pos == "RB" and roster["RB"] >= 5:
+        return False
+    if pos == "WR" and roster["WR"] >= 5:
+        return False
+    if round_num == 1 and pos == "TE":
+        return False
+    return True
+
+def can_draft_mask(available, manager, round_num, ledger):
+    """Vectorized can_draft() over a pool slice"""
+    roster = ledger.roster(manager)
+    pos = available["Position"]
+    mask = has_position(pos)
+    if roster["TE"] >= 2 or round_num == 1:
+        mask &= pos != "TE"
+    for p in ["QB", "RB", "WR"]:
+        if roster[p] >= 5:
+            mask &= pos != p
+    return mask
+
+def get_manager_profile(manager, manager_profiles):
+    log.debug("get_manager_profile() called for manager: %r", manager)
+    profile = manager_profiles.get(manager, {})
+    log.debug("Loaded profile for %s with keys %s", manager, sorted(profile))
+    simprof = profile.get("simulation_profile", {})
+    pick_type_weights = simprof.get("pick_type_weights", {"Freshman": 1, "Ready to Contribute": 1, "Upside": 1})
+    pos_weights = simprof.get("position_weights", {"QB": 1, "RB": 1, "WR": 1, "TE": 1})
+    college_weights = simprof.get("college_weights", {})
+    picktype_by_year = profile.get("picktype_by_year", {})
+    log.debug("%s: pick_type_weights=%s pos_weights=%s college_weights=%s", manager, pick_type_weights, pos_weights, college_weights)
+    log.debug("%s: picktype_by_year=%s", manager, picktype_by_year)
+
+    # Quotas repeat the manager's latest draft (2024 in the shipped profiles)
+    latest = max(picktype_by_year, default="2024")
+    quota_fresh = int(picktype_by_year.get(latest, {}).get("Freshman", 0))
+    quota_upside = int(picktype_by_year.get(latest, {}).get("Upside", 0))
+    quota_rtc = int(picktype_by_year.get(latest, {}).get("Ready to Contribute", 0))
+    log.debug("Quotas for manager %s in %s - Freshman: %s, Upside: %s, RTC: %s", manager, latest, quota_fresh, quota_upside, quota_rtc)
+
+    if "rtc_with_5star_available" in profile and profile["rtc_with_5star_available"]:
+        rtc_lock = int(float(profile["rtc_with_5star_available"][0].get("round", 99)))
+    else:
+        rtc_lock = 99
+    log.debug("%s: rtc_lock=%s", manager, rtc_lock)
+
+    profile_type = "mixed"
+    if pick_type_weights.get("Freshman", 0) > 7:
+        profile_type = "heavy_freshman"
+    elif pick_type_weights.get("Upside", 0) > 7:
+        profile_type = "upside"
+    elif pick_type_weights.get("Ready to Contribute", 0) > 7:
+        profile_type = "rtc"
+    log.debug("%s: profile_type=%s", manager, profile_type)
+    return pick_type_weights, pos_weights, college_weights, quota_fresh, quota_upside, quota_rtc, rtc_lock, profile, profile_type
+
+def compile_profiles(manager_profiles, managers=()):
+    """Resolve get_manager_profile() once per manager so picks never re-read the raw JSON"""
+    names = set(manager_profiles) | {m for m in managers if m}
+    return {m: get_manager_profile(m, manager_profiles) for m in sorted(names)}
+
+def get_years_sorted(draft_history, current_year):
+    current_year_int = int(str(current_year).strip())
+    years = []
+    for y in draft_history.keys():
+        try:
+            y_int = int(str(y).strip())
+        except (ValueError, TypeError):
+            continue
+        if y_int < current_year_int:
+            years.append(y_int)
+    years.sort(reverse=True)
+    return [str(y) for y in years]
+
+def get_last_position_pick(draft_history, round_num, position, current_year):
+    years = get_years_sorted(draft_history, current_year)
+    for year in years:
+        pick = draft_history.get(year, {}).get(str(round_num))
+        if pick and pick["Position"] == position:
+            return year, pick["Player"]
+    return None, None
+
+def get_last_any_pick(draft_history, round_num, current_year):
+    years = get_years_sorted(draft_history, current_year)
+    for year in years:
+        pick = draft_history.get(year, {}).get(str(round_num))
+        if pick:
+            return year, pick["Player"], pick["Position"]
+    return None, None, None
+
+def get_last_picktype_pick(draft_history, round_num, picktype, current_year):
+    years = get_years_sorted(draft_history, current_year)
+    for year in years:
+        pick = draft_history.get(year, {}).get(str(round_num))
+        if pick and pick["PickType"] == picktype:
+            return year, pick["Player"]
+    return None, None
+
+def get_last_fivestar_freshman(draft_history, current_year):
+    years = get_years_sorted(draft_history, current_year)
+    for year in years:
+        for rnd, pick in draft_history.get(year, {}).items():
+            if pick.get("PickType") == "Freshman" and (str(pick.get("Stars", "")) == "5.0" or float(pick.get("Rating", 0)) >= 0.99):
+                return year, pick["Player"]
+    return None, None
+
+def get_consecutive_position_streak(draft_history, round_num, position, current_year, max_window=3):
+    years = get_years_sorted(draft_history, current_year)
+    streak = []
+    for year in years:
+        pick = draft_history.get(year, {}).get(str(round_num))
+        if pick and pick["Position"] == position:
+            streak.append((year, pick["Player"]))
+        else:
+            break
+        if len(streak) >= max_window:
+            break
+    return streak
+
+def get_round_reference(profile, round_num, current_year, current_position, current_picktype, current_stars=None, max_window=3):
+    draft_history = profile.get("draft_history", {})
+    streak = get_consecutive_position_streak(
+        draft_history, round_num, current_position, current_year, max_window
+    )
+    if streak and len(streak) > 1:
+        ordinal = {2: "second", 3: "third", 4: "fourth", 5: "fifth"}
+        ord_word = ordinal.get(len(streak) + 1, f"{len(streak)+1}th")
+        names_and_years = [f"{p[1]} ({p[0]})" for p in streak]
+        return (
+            f" He takes a {current_position} in Round {round_num} for the {ord_word} straight year, "
+            f"following {', '.join(names_and_years)}."
+        )
+
+    last_year, last_player = get_last_position_pick(
+        draft_history, round_num, current_position, current_year
+    )
+    if last_year:
+        try:
+            last_year_int = int(str(last_year).strip())
+            current_year_int = int(str(current_year).strip())
+            if last_year_int == current_year_int - 1:
+                return (
+                    f" He takes a {current_position} in Round {round_num}, "
+                    f"for the second straight year ({last_player} in {last_year_int})."
+                )
+        except (TypeError, ValueError):
+            pass
+
+        last_any_year, last_any_player, last_any_pos = get_last_any_pick(
+            draft_history, round_num, current_year
+        )
+        if last_any_year and last_any_year != last_year:
+            return (
+                f" He takes a {current_position} in Round {round_num}, reverting to his {last_year} selection of {last_player}, "
+                f"after last year's {last_any_pos} ({last_any_player}) pick."
+            )
+        else:
+            return (
+                f" He takes a {current_position} in Round {round_num}, "
+                f"his first time since {last_year} ({last_player})."
+            )
+
+    last_any_year, last_any_player, last_any_pos = get_last_any_pick(
+        draft_history, round_num, current_year
+    )
+    if last_any_year and last_any_pos and last_any_pos != current_position:
+        return (
+            f" He takes a {current_position} in Round {round_num}, "
+            f"contrary to last year when he took a {last_any_pos} ({last_any_player})."
+        )
+
+    if current_picktype == "Freshman":
+        last_year, last_player = get_last_picktype_pick(
+            draft_history, round_num, "Freshman", current_year
+        )
+        if last_year:
+            return (
+                f" He takes a Freshman in Round {round_num}, just as he did in {last_year} ({last_player})."
+            )
+        if (safe_float(current_stars) or 0) >= 5.0:
+            last5_year, last5_player = get_last_fivestar_freshman(
+                draft_history, current_year
+            )
+            if last5_year:
+                return (
+                    f" He takes a 5-star Freshman, as he did in {last5_year} with {last5_player}."
+                )
+
+    years = get_years_sorted(draft_history, current_year)
+    if not years:
+        return ""
+    oldest = years[-1]
+    return (
+        f" This is his first {current_position} in Round {round_num} since {oldest}, or possibly ever."
+    )
+
+def format_adp_phrase(adp, round_num=None):
+    if adp and adp != "" and not str(adp).lower() == "nan":
+        return f"ADP {adp}"
+    if round_num is not None:
+        return f"his selection in round {round_num}"
+    else:
+        return "his draft capital"
+
+# --- TEMPLATES ---
+
+templates_freshman_heavy = [
+    "True to form, {manager} leans on youth by selecting {player}, a {stars}-star freshman from {college} whose athletic spark suggests growth beyond his {adp_phrase}.",
+    "Even without top-tier hype, {player} fits {manager}'s rookie‑first approach: a {stars}-star newcomer with impact potential for round {round}.",
+    "{manager} doubles down on raw talent, grabbing {player}, a {stars}-star freshman whose upside could outpace expectations as the season unfolds.",
+    "With the blue‑chip names gone, {manager} pivots to {player}, whose blend of athleticism and field vision outperforms his {adp_phrase}.",
+    "Refusing to stray from a youth‑heavy strategy, {manager} takes {player}, a {stars}-star rookie whose projection promises long‑term ROI.",
+    "It's a foundational pick for {manager}, who adds {player}, a high-motor, {stars}-star rookie whose developmental curve fits their long-term, freshman-focused strategy.",
+    "No surprise here. {manager} continues to build through the draft, grabbing {player}, a toolsy {stars}-star whose potential is valued more than a veteran's floor.",
+    "This is a classic {manager} move: ignore the safe bet and invest in raw talent. {player} from {college} is a prototypical project pick for them in round {round}.",
+    "Following the selection of {past_pick}, {manager} doubles down on the youth movement, adding {player}, a {stars}-star freshman poised to be a future building block.",
+    "Chalk it up. {manager} goes back to the well for another high-upside freshman, grabbing {player} and betting that his traits will translate faster than the market expects.",
+    "While others fill immediate needs, {manager} invests in the future with {player}. His {stars}-star pedigree and raw skills make him an ideal fit for this roster's philosophy.",
+    "{manager} sees something they like in the {college} pipeline, grabbing {player}. This pick screams developmental upside, a hallmark of their drafting style.",
+    "The board fell perfectly for {manager} to snag {player}, a {stars}-star talent who might have a low floor but possesses a ceiling that aligns with a youth-first approach.",
+]
+templates_freshman_mixed = [
+    "Balancing veterans and prospects, {manager} adds {player}, a {stars}-star freshman from {college} whose versatility pairs well with established pieces.",
+    "In a hybrid maneuver, {manager} opts for {player}—a mid‑tier rookie whose growth potential won't break the bank.",
+    "{player} isn't a household name, but for a balanced roster, {manager} sees his {stars}-star ceiling and {adp_phrase} as ideal filler.",
+    "Seeking stability with a dash of upside, {manager} picks {player}, a freshman whose future role justifies the pick in round {round}.",
+    "True to their mixed blueprint, {manager} secures {player}, a freshman with a solid base and room to grow—especially at {adp_phrase}.",
+    "This is a portfolio pick for {manager}. {player} offers a dash of upside without forcing a full rebuild, complementing their hybrid roster construction.",
+    "Seeking stability with a hint of upside, {manager} picks {player}, a {stars}-star freshman whose future role justifies the selection in round {round}.",
+    "{player} isn't a headline-grabber, but for a balanced roster, {manager} sees his ceiling and reasonable {adp_phrase} as an ideal, low-risk investment.",
+    "With their core set, {manager} takes a shot on {player}. The {stars}-star rookie provides valuable depth and a potential future starter without disrupting the team's win-now focus.",
+    "This selection is all about measured upside. {manager} eschews older players to add {player}, a freshman whose long-term potential could pay dividends.",
+    "{manager} hedges their bets with {player}, a promising {stars}-star from {college} who can develop behind veterans and potentially emerge as a key contributor down the line.",
+]
+templates_freshman_elite = [
+    "When talent like {player}—a 5‑star from {college}—drops to the board, {manager} snaps him up, locking in franchise upside at {adp_phrase}.",
+    "Elite recruits don't last: {manager} wastes no time drafting {player}, a 5‑star rookie primed for immediate impact.",
+    "This is a can't‑miss pick: {player} offers size, skill, and college production, and {manager} seals the deal in round {round}.",
+    "Consensus agrees on {player}'s ceiling—5‑star status and proven tape—so {manager} adds him without hesitation.",
+    "Franchise upside is on the table, so {manager} grabs {player}, a 5‑star talent whose projection smokes his {adp_phrase}.",
+    "When talent like {player}—a 5-star from {college}—is on the board, you take him. {manager} snaps up a potential franchise cornerstone, locking in elite upside at {adp_phrase}.",
+    "This is a no-brainer. {manager} wastes no time drafting {player}, a 5-star rookie primed for immediate, game-changing impact from day one.",
+    "Sometimes the pick makes itself. {player} was the best player available by a mile, and {manager} wisely secures a blue-chip talent to build around.",
+    "Consensus agrees on {player}'s ceiling—5-star status and dominant tape—so {manager} adds him without hesitation, instantly upgrading their roster's potential.",
+    "It's a gift at this spot in round {round}. {manager} lands {player}, a 5-star prospect from {college} who brings a rare combination of size, skill, and polish.",
+    "This is how championships are built. {manager} grabs {player}, a transcendent 5-star talent whose projection smokes his {adp_phrase}.",
+    "No need to overthink it. {player} is an elite, plug-and-play prospect, and {manager} makes the obvious, high-value choice to anchor their team for years to come.",
+    "The league was put on notice with this pick. {manager} secures the most coveted prize on the board in {player}, a 5-star dynamo with league-winning potential.",
+]
+templates_upside = [
+    "Swinging for the fences, {manager} pulls the trigger on {player}, a high‑variance prospect whose {adp_phrase} will look like a steal if he breaks out.",
+    "Floor is secondary to ceiling here: {manager} bets on {player}'s raw tools to ignite big returns.",
+    "With championship aspirations, {manager} reaches for {player}, banking on upside over safety.",
+    "This pick screams upside: {player} brings explosive traits and high ceiling—perfect for a bold gamble.",
+    "{manager} takes a coin‑flip chance on {player}, a boom‑or‑bust rookie who could redefine this draft.",
+    "This pick is all about potential energy. {manager} bets on {player}'s raw, explosive tools, ignoring the low floor for a shot at a massive return.",
+    "With championship aspirations, {manager} reaches for {player}, banking on game-breaking upside over a safer, lower-impact alternative.",
+    "This is a classic lottery ticket. {manager} takes a coin-flip chance on {player}, a boom-or-bust prospect who could either redefine this team or be a total bust.",
+    "Forget the safe play; {manager} is hunting for a league-winner. {player} has a questionable floor but possesses the kind of ceiling that can single-handedly win a title.",
+    "Some will call it a reach, but {manager} sees superstar potential. They grab {player}, a raw but athletically gifted player they believe can be molded into a dominant force.",
+    "This pick could define their season. {manager} bypasses several higher-floor players to gamble on the immense, unpolished upside of {player}.",
+]
+templates_rtc_profile = [
+    "Staying on script, {manager} selects {player}, a dependable talent whose track record and {adp_phrase} align perfectly with round {round} norms.",
+    "No surprises: {manager} locks in value with {player}, a balanced prospect meeting expectations for this stage.",
+    "Right player, right round—{player} offers a safe floor and moderate upside, matching the pick's profile.",
+    "By‑the‑book selection: {player} delivers consistency and fits {manager}'s plan for round {round}.",
+    "{player} slots seamlessly into the roster, hitting the sweet spot of risk and reward that {manager} targets in this round.",
+    "No surprises here. {manager} locks in solid value with {player}, a balanced prospect who meets all expectations for this stage of the draft.",
+    "This is a bread-and-butter selection. {player} offers a safe floor and moderate upside, perfectly matching the pick's profile and {manager}'s steady approach.",
+    "Right player, right price, right round. {manager} makes the logical choice in {player}, a player who slots seamlessly into the roster without unnecessary risk.",
+    "By-the-book drafting from {manager}. {player} delivers consistency and fills a need, hitting the sweet spot of risk and reward they target in this round.",
+    "After a risky pick like {past_pick}, {manager} smartly pivots to a high-floor player in {player}, bringing balance back to their draft.",
+    "{player} is exactly the kind of solid, unspectacular value you look for here. {manager} continues a disciplined draft by taking the best available player who fits their system.",
+]
+templates_forced = [
+    "With ideal targets gone, {manager} begrudgingly takes {player}, a fallback option that fills the need but clashes with their blueprint.",
+    "Plan A evaporated, so {manager} scraps the board and swings on {player}, a second‑tier choice born of necessity.",
+    "Out of better options, {manager} pivots to {player}, hoping this stopgap pick can overdeliver.",
+    "Draft day chaos forces {manager} into {player}, an off‑scheme selection that serves as a temporary patch.",
+    "Favorites off the board, {manager} settles for {player}, praying this unplanned choice pays off.",
+    "With their primary targets gone, {manager} begrudgingly takes {player}, a fallback option that fills an immediate need but clashes with their preferred blueprint.",
+    "Plan A clearly evaporated. {manager} is forced to scrap the board and swing on {player}, a second-tier choice born of draft-day necessity.",
+    "You can feel the frustration. After being sniped on their preferred players, {manager} settles for {player}, hoping this stopgap pick can overdeliver.",
+    "This feels like a panic move. Draft day chaos forces {manager} into selecting {player}, an off-scheme choice that serves as a temporary patch rather than a strategic fit.",
+    "The board did not fall {manager}'s way. Out of better options, they pivot to {player}, a pick that feels more like a concession than a conviction.",
+    "A clear departure from their strategy. With the players they coveted off the board, {manager} takes {player} in a move that screams \"making the best of a bad situation.\"",
+    "{manager} was backed into a corner here and had to take {player}. It's a pick that prevents a total disaster at the position but strays far from their game plan.",
+]
+templates_rtc_outlier = [
+    "Defying convention, {manager} pounces on {player} at pick {round}, leaping past {adp_phrase} to snatch high potential.",
+    "Shock move: {manager} vaults for {player} rounds early, trading draft capital for breakout upside.",
+    "In a bold twist, {manager} overpays for {player}, drafting him well ahead of market expectations.",
+    "Ignoring the script, {manager} pulls the trigger on {player} early, convinced his ceiling warrants the risk.",
+    "This pick breaks the mold: {manager} jumps the ADP and secures {player} in a surprise move that could shift the league.",
+    "Defying convention, {manager} pounces on {player} at pick {round}, leaping past his {adp_phrase} to snatch a player they clearly believe in.",
+    "This is a shocker! {manager} vaults for {player} rounds earlier than expected, signaling a massive conviction in his potential and ignoring market value.",
+    "In a bold, head-turning twist, {manager} overpays for {player}, drafting him well ahead of his {adp_phrase}. This is a \"my guy\" pick, through and through.",
+    "Tearing up the script! {manager} pulls the trigger on {player} now, convinced his ceiling warrants the aggressive reach and unwilling to risk him being taken later.",
+    "This pick breaks the mold and could shift the league. {manager} jumps the ADP queue to secure {player}, sending a message that they see something others don't.",
+    "Wow, what a reach! {manager} plants their flag on {player}, drafting him far ahead of consensus rankings. Time will tell if this was visionary or reckless.",
+    "Ignoring all mock drafts and projections, {manager} aggressively targets and lands {player} in round {round}. This is a high-risk, high-conviction move that will be debated all season.",
+]
+
+def human_explain_pick(manager, row, round_num, profile_type, outlier=False, quota_exceeded=False, quotas=None, counts=None, rtc_lock=None, profile=None, current_year="2025"):
+    player = row['Player']
+    college = row['College']
+    picktype = row['PickType']
+    stars = row.get('Stars', '')
+    rating = row.get('Rating', '')
+    adp = row.get('ADP', '')
+    adp_phrase = format_adp_phrase(adp, round_num)
+    position = row['Position']
+    past_ref = ""
+    if profile is not None and round_num <= 3 and position in ["WR","RB","QB","TE"]:
+        past_ref = get_round_reference(profile, round_num, current_year, position, picktype, current_stars=stars, max_window=3)
+    template = None
+    if outlier or (quota_exceeded and quotas and counts and picktype in quotas and counts.get(picktype,0) > quotas.get(picktype,99)):
+        template = random.choice(templates_forced)
+    elif picktype == "RTC" and rtc_lock and round_num < rtc_lock:
+        template = random.choice(templates_rtc_outlier)
+    elif picktype == "Freshman" and (is_consensus_elite(player) or (safe_float(stars) or 0) >= 5.0):
+        template = random.choice(templates_freshman_elite)
+    elif picktype == "Freshman" and profile_type == "heavy_freshman":
+        template = random.choice(templates_freshman_heavy)
+    elif picktype == "Freshman":
+        template = random.choice(templates_freshman_mixed)
+    elif picktype == "Upside":
+        template = random.choice(templates_upside)
+    elif picktype == "RTC":
+        template = random.choice(templates_rtc_profile)
+    else:
+        template = "{manager} made a pragmatic pick with {player}, adapting to how the draft was unfolding."
+    explanation = template.format(
+        manager=manager, player=player, stars=stars, college=college, adp_phrase=adp_phrase, round=round_num, rating=rating,
+        past_pick=""
+    )
+    if past_ref:
+        explanation = explanation.rstrip('.') + "." + past_ref
+    return explanation
+
+# --- SCORING PARAMETERS ---
+class ScoringParams(NamedTuple):
+    """Hand-tuned constants of the pick model; the defaults are the shipped values"""
+    rating: float = 1.0
+    stars: float = 0.8
+    pos_bias: float = 0.08
+    college_bias: float = 0.008
+    adp: float = 0.03
+    qb_boost: float = 0.17
+    qb_boost_rating: float = 0.94
+    te_boost: float = 0.15
+    te_boost_rating: float = 0.96
+    top_n: int = 4
+    force_te_round: int = 6
+
+DEFAULT_PARAMS = ScoringParams()
+
+def pool_features(pool):
+    """The manager-independent numeric columns scores are built from, converted once per pool"""
+    return {
+        "stars": numeric_column(pool["Stars"]).fillna(0),
+        "rating": numeric_column(pool["Rating"]).fillna(0),
+        "adp": numeric_column(pool["ADP"]),
+    }
+
+def score_players(avail, profile, adp_fill=1000, params=DEFAULT_PARAMS, features=None):
+    """draft_pick's score for every row of a pool slice, from one manager's point of view.
+    features is pool_features(avail) when the caller already has it."""
+    simprof = profile.get("simulation_profile", {})
+    pos_weights = simprof.get("position_weights", {"QB": 1, "RB": 1, "WR": 1, "TE": 1})
+    college_weights = simprof.get("college_weights", {})
+
+    # Score formula: manager profile-based, rating/star dominant, now with ADP factor.
+    # Kept as a standalone Series so the shared pool slice is never copied or mutated.
+    features     = pool_features(avail) if features is None else features
+    stars_num    = features["stars"]
+    rating_num   = features["rating"]
+    pos_bias     = map_weights(avail["Position"], pos_weights)
+    college_bias = map_weights(avail["NormCollege"], college_weights)
+
+    # Current scoring formula
+    score = (
+        rating_num * params.rating +
+        stars_num * params.stars +
+        pos_bias.fillna(0) * params.pos_bias +
+        college_bias.fillna(0) * params.college_bias +
+        (-features["adp"].fillna(adp_fill) * params.adp)
+    )
+
+    # Special boost for high-rated QBs (Rating > 0.9400)
+    high_rated_qb_mask = (avail["Position"] == "QB") & (rating_num > params.qb_boost_rating)
+    score[high_rated_qb_mask] += params.qb_boost  # Small boost to move them up in draft order
+
+    # Special boost for high-rated TEs (Rating > 0.9600)
+    high_rated_te_mask = (avail["Position"] == "TE") & (rating_num > params.te_boost_rating)
+    score[high_rated_te_mask] += params.te_boost  # Small boost for elite TEs
+    return score
+
+def consensus_score(avail, pos_weights, col_weights, params=DEFAULT_PARAMS, features=None):
+    """Consensus Top 3 score: profile biases plus rating and stars, no ADP term and no boosts"""
+    features = pool_features(avail) if features is None else features
+    pos_bias = map_weights(avail["Position"], pos_weights)
+    college_bias = map_weights(avail["NormCollege"], col_weights)
+    return pos_bias * params.pos_bias + college_bias * params.college_bias + \
+        features["rating"] * params.rating + \
+        features["stars"] * params.stars
+
+def build_score_matrices(pool, compiled_profiles, params=DEFAULT_PARAMS, features=None):
+    """Scores only depend on (manager, player), so compute them once for the whole pool.
+
+    Returns (score_rows, scores, consensus_scores): score_rows maps a manager to its row,
+    scores[row] is score_players() over every pool row and consensus_scores[row] the
+    Consensus Top 3 variant. Both are float32 [manager, pool row] and read-only.
+    """
+    managers = sorted(compiled_profiles)
+    features = pool_features(pool) if features is None else features
+    scores = np.zeros((len(managers), len(pool)), dtype=np.float32)
+    consensus_scores = np.zeros((len(managers), len(pool)), dtype=np.float32)
+    for row, manager in enumerate(managers):
+        pt_weights, pos_weights, col_weights, *_, profile, profile_type = compiled_profiles[manager]
+        scores[row] = score_players(pool, profile, params=params, features=features).to_numpy(dtype=np.float32)
+        consensus_scores[row] = consensus_score(pool, pos_weights, col_weights, params, features).to_numpy(dtype=np.float32)
+    scores.flags.writeable = False
+    consensus_scores.flags.writeable = False
+    return {m: row for row, m in enumerate(managers)}, scores, consensus_scores
+
+# --- PICK RULES: DECLARATIVE TABLE COMPILED TO MASKS OVER THE POOL ---
+# pick_rules.json lists, in order:
+#   filters: {"name", "kind": "eligibility" | "exclusion", "when", "keep" | "drop": predicate}
+#   stages:  {"branch", "when", "candidates": predicate, "outlier", "from": "eligible",
+#             "score": "consensus", "explain": {"quotas", "counts", "rtc_lock"}}
+# Predicates only look at pool columns, so they are compiled once into boolean masks;
+# "when" conditions look at the pick (manager, round, counters) and are checked per pick.
+# A stage draws uniformly among the top_n best scored of its candidates, and the first
+# stage with candidates wins. Eligibility filters apply to every stage, exclusions only
+# to stages that do not take their candidates "from": "eligible".
+
+class CompiledRules(NamedTuple):
+    table: dict
+    filters: list  # [(rule, mask)]
+    stages: list   # [(rule, mask)]
+
+RULE_CONDITIONS = {
+    "manager", "round", "round_min", "round_max", "round_below", "pick_idx", "pick_idx_below",
+    "quota_open", "five_star_skipper", "roster_at_least", "drafted_at_least", "drafted_none",
+    "position_weight_below",
+}
+
+def load_pick_rules(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def predicate_mask(frame, predicate):
+    """Boolean array over frame's rows for one rule predicate (all clauses must hold)"""
+    mask = np.ones(len(frame), dtype=bool)
+    for key, value in predicate.items():
+        if key == "has_position":
+            clause = has_position(frame["Position"]).to_numpy(dtype=bool)
+        elif key == "five_star_freshman":
+            clause = is_5star_freshman_mask(frame).to_numpy(dtype=bool)
+        elif key == "adp_max":
+            clause = (numeric_column(frame["ADP"]) <= value).to_numpy(dtype=bool)
+        elif key in frame.columns:
+            values = value if isinstance(value, list) else [value]
+            if key == "NormPlayer":
+                values = [normalize_name(v) for v in values]
+            clause = frame[key].isin(values).to_numpy(dtype=bool)
+        else:
+            raise ValueError(f"Unknown pick rule predicate: {key}")
+        if key in ("has_position", "five_star_freshman") and value is False:
+            clause = ~clause
+        mask &= clause
+    return mask
+
+def compile_rules(table, frame):
+    """Check every condition name and turn every predicate into a mask over frame"""
+    for rule in table.get("filters", []) + table.get("stages", []):
+        unknown = set(rule.get("when", {})) - RULE_CONDITIONS
+        if unknown:
+            raise ValueError(f"Unknown pick rule condition(s) in {rule.get('name', rule.get('branch'))}: {sorted(unknown)}")
+    filters = []
+    for rule in table.get("filters", []):
+        if ("keep" in rule) == ("drop" in rule):
+            raise ValueError(f"Pick rule filter {rule.get('name')} needs exactly one of keep/drop")
+        mask = predicate_mask(frame, rule.get("keep", rule.get("drop")))
+        filters.append((rule, mask if "keep" in rule else ~mask))
+    stages = [(rule, predicate_mask(frame, rule.get("candidates", {}))) for rule in table.get("stages", [])]
+    return CompiledRules(table, filters, stages)
+
+def rule_applies(when, ctx):
+    """Check a rule's "when" conditions against the pick context"""
+    def resolve(v):
+        return ctx[v] if isinstance(v, str) else v
+    for key, value in when.items():
+        if key == "manager":
+            ok = ctx["manager"] in (value if isinstance(value, list) else [value])
+        elif key == "round":
+            ok = ctx["round_num"] == value
+        elif key == "round_min":
+            ok = ctx["round_num"] >= resolve(value)
+        elif key == "round_max":
+            ok = ctx["round_num"] <= resolve(value)
+        elif key == "round_below":
+            ok = ctx["round_num"] < resolve(value)
+        elif key == "pick_idx":
+            ok = ctx["pick_idx"] == value
+        elif key == "pick_idx_below":
+            ok = ctx["pick_idx"] < value
+        elif key == "quota_open":
+            ok = ctx["counts"].get(value, 0) < ctx["quotas"].get(value, 0)
+        elif key == "five_star_skipper":
+            ok = is_5star_skipper(ctx["profile"]) == value
+        elif key == "roster_at_least":
+            ok = all(ctx["roster"].get(p, 0) >= n for p, n in value.items())
+        elif key == "drafted_at_least":
+            ok = all(ctx["held"].get(p, 0) >= n for p, n in value.items())
+        elif key == "drafted_none":
+            ok = ctx["held"].get(value, 0) == 0
+        elif key == "position_weight_below":
+            pos_weights = ctx["profile"].get("simulation_profile", {}).get("position_weights", {})
+            ok = all(pos_weights.get(p, 0) < w for p, w in value.items())
+        if not ok:
+            return False
+    return True
+
+def rule_stages(rules, ctx, available):
+    """Ordered [(branch, candidate positions, outlier)] for one pick plus per-branch options.
+
+    available is a boolean array over the frame the rules were compiled for; candidates
+    are integer positions into that frame, so no intermediate DataFrames are built.
+    """
+    eligible = available.copy()
+    filtered = None
+    for rule, mask in rules.filters:
+        if rule.get("kind") == "exclusion" and filtered is None:
+            filtered = eligible.copy()
+        if rule_applies(rule.get("when", {}), ctx):
+            if filtered is None:
+                eligible &= mask
+            else:
+                filtered &= mask
+    if filtered is None:
+        filtered = eligible
+    stages, options = [], {}
+    for rule, mask in rules.stages:
+        if not rule_applies(rule.get("when", {}), ctx):
+            continue
+        base = eligible if rule.get("from") == "eligible" else filtered
+        branch = rule["branch"]
+        stages.append((branch, np.flatnonzero(base & mask), bool(rule.get("outlier", False))))
+        options[branch] = rule
+    return stages, options
+
+def rank_candidates(candidates, score):
+    """Candidate positions ordered best score first (ties as pandas orders them)"""
+    return pd.Series(score[candidates], index=candidates).sort_values(ascending=False).index.to_numpy()
+
+def sample_top(candidates, score, n=4, rng=None):
+    """Uniform draw among the n best-scored candidates; returns a position. rng is a
+    np.random.RandomState (the global NumPy RNG when None); seeded with s it draws
+    exactly what np.random.seed(s) would."""
+    top_n = pd.Series(rank_candidates(candidates, score)[:n])
+    return int(top_n.sample(n=1, random_state=rng).iloc[0])
+
+def draw_from_stages(stages, score, stage_scores=None, top_n=4, rng=None):
+    """Uniform top-4 draw from the first non-empty stage; returns (branch, position, outlier) or None.
+
+    stage_scores optionally overrides the ranking score for individual branches.
+    """
+    for branch, candidates, outlier in stages:
+        if len(candidates):
+            return branch, sample_top(candidates, (stage_scores or {}).get(branch, score), n=top_n, rng=rng), outlier
+    return None
+
+def stage_explain_args(rule, quotas, counts, rtc_lock):
+    """(quotas, counts, rtc_lock) for human_explain_pick, with a stage's "explain" overrides"""
+    explain = rule.get("explain")
+    if not explain:
+        return quotas, counts, rtc_lock
+    if "quotas" in explain:
+        quotas = {t: explain["quotas"] for t in ["Freshman", "Upside", "RTC"]}
+    if "counts" in explain:
+        counts = {t: explain["counts"] for t in ["Freshman", "Upside", "RTC"]}
+    return quotas, counts, explain.get("rtc_lock", rtc_lock)
+
+def pick_context(manager, round_num, pick_idx, quotas, counts, rtc_lock, profile, roster, params, held=None):
+    """roster is the manager's {position: count} in this draft, read by the roster_* caps;
+    held adds players carried over from earlier seasons and feeds the drafted_* conditions
+    (the same as roster in a single draft)"""
+    return {
+        "manager": manager, "round_num": round_num, "pick_idx": pick_idx, "quotas": quotas,
+        "counts": counts, "rtc_lock": rtc_lock, "profile": profile, "roster": roster,
+        "held": roster if held is None else held, "force_te_round": params.force_te_round,
+    }
+
+def roster_counts(drafted_list):
+    """{position: count} from a list of drafted player dicts"""
+    roster = {p: 0 for p in LEDGER_POSITIONS}
+    for p in drafted_list or []:
+        roster[p["Position"]] = roster.get(p["Position"], 0) + 1
+    return roster
+
+def draft_pick(
+    manager,
+    available,
+    round_num,
+    already_drafted,
+    pick_number,
+    quotas,
+    rtc_lock,
+    picktype_weights,
+    counts,
+    profile_type,
+    profile,
+    current_year="2025",
+    drafted_list=None,
+    explain=True,
+    params=DEFAULT_PARAMS,
+    rules_table=None,
+    roster=None
+):
+    """Standalone pick over any available DataFrame; the rules are compiled against it"""
+    avail = available
+    if avail.empty:
+        return None, "No eligible player found."
+    rules = compile_rules(rules_table or load_pick_rules(PICK_RULES_FILE), avail)
+    if roster is None:
+        roster = roster_counts(drafted_list)
+    ctx = pick_context(manager, round_num, pick_number - 1, quotas, counts, rtc_lock, profile, roster, params)
+    stages, options = rule_stages(rules, ctx, np.ones(len(avail), dtype=bool))
+    score = score_players(avail, profile, params=params).to_numpy()
+    drawn = draw_from_stages(stages, score, top_n=params.top_n)
+    if drawn is None:
+        return None, "No eligible player found."
+    branch, pos, outlier = drawn
+    pick_row = avail.iloc[pos]
+    quotas, counts, rtc_lock = stage_explain_args(options[branch], quotas, counts, rtc_lock)
+    expl = human_explain_pick(
+        manager, pick_row, round_num, profile_type, outlier, False,
+        quotas, counts, rtc_lock, profile, current_year=current_year
+    ) if explain else ""
+    return pick_row, expl
+
+# --- DRAFT PLAN: THE DRAFT ORDER COMPILED TO ARRAYS ---
+class DraftPlan(NamedTuple):
+    """One entry per draft order slot. manager_ids index managers (the score_rows order),
+    -1 for skipped comp/empty slots. next_slot[i, m] is manager m's first slot at or after
+    i, or n_slots when m has none left, so upcoming picks are found without scanning."""
+    rounds: np.ndarray
+    overall_picks: np.ndarray
+    manager_ids: np.ndarray
+    skip: np.ndarray
+    managers: list
+    next_slot: np.ndarray
+
+def compile_draft_plan(draft_order, score_rows, trades=None):
+    """trades: {overall pick: manager} for picks that changed hands"""
+    trades = {int(k): normalize_name(m) for k, m in (trades or {}).items()}
+    overall_picks = draft_order["Overall Pick"].to_numpy(dtype=np.int16)
+    names = [trades.get(int(o), normalize_name(m)) for o, m in zip(overall_picks, draft_order["Manager"])]
+    unknown = sorted({m for m in names if m and m not in score_rows})
+    if unknown:
+        raise ValueError(f"Draft order has managers without a score row: {unknown}")
+    manager_ids = np.array([score_rows[m] if m else -1 for m in names], dtype=np.int16)
+    n = len(manager_ids)
+    next_slot = np.full((n + 1, len(score_rows)), n, dtype=np.int32)
+    for i in range(n - 1, -1, -1):
+        next_slot[i] = next_slot[i + 1]
+        if manager_ids[i] >= 0:
+            next_slot[i, manager_ids[i]] = i
+    managers = sorted(score_rows, key=score_rows.get)
+    return DraftPlan(draft_order["Round"].to_numpy(dtype=np.int16), overall_picks, manager_ids, manager_ids < 0, managers, next_slot)
+
+def slot_info(plan, idx):
+    """(manager, round_num, overall_pick) of slot idx; manager is "" for skipped slots"""
+    m = plan.manager_ids[idx]
+    return (plan.managers[m] if m >= 0 else ""), int(plan.rounds[idx]), int(plan.overall_picks[idx])
+
+def next_slot_of(plan, manager, from_idx):
+    """manager's first slot at or after from_idx, or None"""
+    if manager not in plan.managers or from_idx >= len(plan.manager_ids):
+        return None
+    idx = int(plan.next_slot[from_idx, plan.managers.index(manager)])
+    return idx if idx < len(plan.manager_ids) else None
+
+def next_stop(plan, managers, from_idx):
+    """First slot at or after from_idx owned by any of managers (n_slots when none is left)"""
+    n = len(plan.manager_ids)
+    if from_idx >= n:
+        return n
+    cols = [plan.managers.index(m) for m in managers if m in plan.managers]
+    return int(plan.next_slot[from_idx, cols].min()) if cols else n
+
+def manager_slots(plan, manager, from_idx=0):
+    """Every slot of manager from from_idx on, following the jump table"""
+    slots = []
+    idx = next_slot_of(plan, manager, from_idx)
+    while idx is not None:
+        slots.append(idx)
+        idx = next_slot_of(plan, manager, idx + 1)
+    return slots
+
+def trade_picks(data, trades):
+    """DraftData where the picks in trades ({overall pick: manager}) belong to their new managers"""
+    trades = {int(k): normalize_name(m) for k, m in trades.items()}
+    draft_order = data.draft_order.copy()
+    traded = draft_order["Overall Pick"].isin(list(trades))
+    draft_order.loc[traded, "Manager"] = draft_order.loc[traded, "Overall Pick"].map(trades)
+    return data._replace(draft_order=draft_order, plan=compile_draft_plan(draft_order, data.score_rows))
+
+class DraftData(NamedTuple):
+    """Read-only inputs shared by every session in the process; never mutate these frames"""
+    draft_order: pd.DataFrame
+    pool: pd.DataFrame
+    manager_profiles: dict
+    compiled_profiles: dict
+    player_index: dict
+    score_rows: dict
+    scores: np.ndarray
+    consensus_scores: np.ndarray
+    params: ScoringParams = DEFAULT_PARAMS
+    rules: CompiledRules = None
+    version: str = ""   # digest of the input files; changes whenever a CSV, profile or rule file does
+    plan: DraftPlan = None
+    file_hashes: dict = None   # {input file: sha1} behind version, for refresh_data()
+    league: "LeagueConfig" = None   # None for the default league
+
+POOL_COLUMNS = ["NormPlayer", "Player", "College", "NormCollege", "Position", "ADP", "Stars", "Rating", "PickType"]
+POOL_CATEGORIES = ["College", "NormCollege", "Position", "PickType"]
+
+def compact_pool(pool):
+    """Columnar pool: categorical codes for the repeated strings, nullable int8 stars,
+    float32 rating/ADP and an int32 PlayerId equal to the row position.
+
+    Player and NormPlayer stay plain strings: they are unique per row, so categories
+    would not save anything.
+    """
+    pool = pool.reset_index(drop=True)
+    out = pd.DataFrame({"NormPlayer": pool["NormPlayer"].astype(object), "Player": pool["Player"].astype(object)})
+    for col in POOL_CATEGORIES:
+        out[col] = pool[col].astype("category")
+    out["ADP"] = numeric_column(pool["ADP"]).astype(np.float32)
+    out["Stars"] = numeric_column(pool["Stars"]).round().astype("Int8")
+    out["Rating"] = numeric_column(pool["Rating"]).astype(np.float32)
+    out["PlayerId"] = np.arange(len(pool), dtype=np.int32)
+    return out[POOL_COLUMNS + ["PlayerId"]]
+
+def with_params(data, params):
+    """Same data under another ScoringParams; only the score matrices are rebuilt"""
+    score_rows, scores, consensus_scores = build_score_matrices(data.pool, data.compiled_profiles, params)
+    return data._replace(score_rows=score_rows, scores=scores, consensus_scores=consensus_scores, params=params)
+
+def read_adp_file(path):
+    """Pool columns for an ADP list (Player;College;Position;ADP); every row is an RTC pick"""
+    adp = pd.read_csv(path, sep=";")
+    adp["NormPlayer"] = adp["Player"].apply(normalize_name)
+    adp["NormCollege"] = adp["College"].apply(normalize_college)
+    adp["ADP"] = adp["ADP"].apply(safe_float)
+    adp["PickType"] = "RTC"
+    adp = ensure_columns(adp, ["Stars", "Rating"])
+    adp_clean = adp.dropna(axis=1, how="all").copy()
+    adp_clean = ensure_columns(adp_clean, ["Stars", "Rating"])
+    return ensure_columns(adp_clean, POOL_COLUMNS)[POOL_COLUMNS].dropna(axis=1, how="all")
+
+def read_freshman_file(path):
+    """Pool columns for a 247 freshman ranking (Name;Position;School;Stars;Rating)"""
+    freshman = pd.read_csv(path, sep=";", encoding="latin1")
+    freshman["NormPlayer"] = freshman["Name"].apply(normalize_name)
+    freshman["NormCollege"] = freshman["School"].apply(normalize_college)
+    freshman = ensure_columns(freshman, ["ADP", "Stars", "Rating"])
+    freshman["PickType"] = "Freshman"
+    freshman_clean = freshman.dropna(axis=1, how="all").copy()
+    freshman_clean = ensure_columns(freshman_clean, ["ADP", "Stars", "Rating"])
+    freshman_clean = freshman_clean.rename(
+        columns={"Name": "Player", "School": "College", "NormCollege": "NormCollege"}
+    )
+    return ensure_columns(freshman_clean, POOL_COLUMNS)[POOL_COLUMNS].dropna(axis=1, how="all")
+
+def load_player_sources(base_dir="."):
+    """[(source name, frame with the pool columns, file hash)] for the ranking files, in merge priority order"""
+    freshman_path, adp_path = os.path.join(base_dir, FRESHMAN_FILE), os.path.join(base_dir, ADP_FILE)
+    return [
+        (FRESHMAN_FILE, read_freshman_file(freshman_path), file_hash(freshman_path)),
+        (ADP_FILE, read_adp_file(adp_path), file_hash(adp_path)),
+    ]
+
+def label_upside(pool):
+    """RTC players at Upside colleges going after ADP 45 (or undrafted in ADP) are Upside picks"""
+    upside_idx = (pool["PickType"] == "RTC") & (pool["NormCollege"].isin(UPSIDE_ELIGIBLE_COLLEGES)) & (pd.to_numeric(pool["ADP"], errors="coerce").fillna(9999) > 45)
+    pool.loc[upside_idx, "PickType"] = "Upside"
+    return pool
+
+def merge_sources(sources, matcher):
+    """One pool row per canonical player, taken from the first source that has it.
+
+    Returns the pool (sorted by NormPlayer) and {dropped NormPlayer: kept NormPlayer}
+    for the spellings that were merged away.
+    """
+    parts = []
+    for priority, (name, frame, _) in enumerate(sources):
+        ids = matcher.canonical_ids(name)
+        parts.append(frame.assign(CanonicalId=frame["NormPlayer"].map(ids), Priority=priority))
+    merged = pd.concat(parts, ignore_index=True).sort_values(["Priority", "NormPlayer"], kind="stable")
+    keep = merged.drop_duplicates("CanonicalId", keep="first")
+    kept_name = keep.set_index("CanonicalId")["NormPlayer"]
+    dropped = merged.drop(keep.index)
+    aliases = dict(zip(dropped["NormPlayer"], dropped["CanonicalId"].map(kept_name)))
+    aliases = {a: p for a, p in aliases.items() if a != p}
+    pool = keep.drop(columns=["CanonicalId", "Priority"]).sort_values(["NormPlayer", "PickType"], ascending=[True, True])
+    return pool.reset_index(drop=True), aliases
+
+# --- LEAGUES: ONE SHARED PLAYER POOL, PER-LEAGUE ORDER, PROFILES AND RULES ---
+# The merged pool depends only on the ranking files, so every league of a deployment
+# drafts from the same PlayerPool object; a league adds its draft order, profiles and
+# rule table and the manager score rows built from them. File names are relative to
+# base_dir and double as the keys of DraftData.file_hashes.
+RANKING_FILES = [FRESHMAN_FILE, ADP_FILE]
+
+class LeagueConfig(NamedTuple):
+    league_id: str = "default"
+    name: str = ""
+    draft_order: str = DRAFT_ORDER_FILE
+    profiles: str = PROFILES_FILE
+    rules: str = PICK_RULES_FILE
+
+DEFAULT_LEAGUE = LeagueConfig()
+
+class PlayerPool(NamedTuple):
+    """The merged player pool and what every league derives from it"""
+    pool: pd.DataFrame
+    player_index: dict
+    features: dict       # pool_features(pool)
+    file_hashes: dict    # {ranking file: sha1}
+
+def league_files(league=DEFAULT_LEAGUE):
+    return [league.draft_order, league.profiles, league.rules]
+
+def input_paths(base_dir=".", league=DEFAULT_LEAGUE):
+    """{file name: path} of every input a league's data depends on"""
+    return {name: os.path.join(base_dir, name) for name in RANKING_FILES + league_files(league)}
+
+def input_version(file_hashes):
+    return hashlib.sha1("".join(file_hashes[name] for name in sorted(file_hashes)).encode()).hexdigest()
+
+def _check_files(paths):
+    for file, path in paths.items():
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Missing required file: {file}")
+
+def load_player_pool(base_dir="."):
+    _check_files({name: os.path.join(base_dir, name) for name in RANKING_FILES})
+    sources = load_player_sources(base_dir)
+    matcher = match_sources(sources, os.path.join(base_dir, PLAYER_IDS_FILE))
+    pool, aliases = merge_sources(sources, matcher)
+    pool = compact_pool(label_upside(pool))
+    player_index = {p: i for i, p in enumerate(pool["NormPlayer"])}
+    # Other spellings of a merged player resolve to the row that was kept
+    player_index.update({a: player_index[p] for a, p in aliases.items() if a not in player_index})
+    return PlayerPool(pool, player_index, pool_features(pool), {name: h for name, _, h in sources})
+
+def league_data(players, league=DEFAULT_LEAGUE, base_dir=".", params=DEFAULT_PARAMS):
+    """DraftData for one league over the shared players; the pool, index and features are
+    the PlayerPool's own objects, not copies"""
+    paths = {name: os.path.join(base_dir, name) for name in league_files(league)}
+    _check_files(paths)
+    draft_order = pd.read_csv(paths[league.draft_order], sep=";")
+    draft_order["Manager"] = draft_order["Manager"].astype(str).apply(lambda m: str(m).strip().upper() if str(m).strip().upper() != "NAN" else "")
+    draft_order["Overall Pick"] = range(1, len(draft_order) + 1)
+    with open(paths[league.profiles], encoding="utf-8") as f:
+        manager_profiles = json.load(f)
+    manager_profiles = {str(k).strip().upper(): v for k, v in manager_profiles.items()}
+    compiled_profiles = compile_profiles(manager_profiles, draft_order["Manager"].unique())
+    score_rows, scores, consensus_scores = build_score_matrices(players.pool, compiled_profiles, params, players.features)
+    rules = compile_rules(load_pick_rules(paths[league.rules]), players.pool)
+    file_hashes = dict(players.file_hashes, **{name: file_hash(path) for name, path in paths.items()})
+    plan = compile_draft_plan(draft_order, score_rows)
+    return DraftData(
+        draft_order, players.pool, manager_profiles, compiled_profiles, players.player_index, score_rows, scores,
+        consensus_scores, params, rules, input_version(file_hashes), plan, file_hashes,
+        None if league == DEFAULT_LEAGUE else league
+    )
+
+def load_data(base_dir=".", params=DEFAULT_PARAMS, league=DEFAULT_LEAGUE):
+    _check_files(input_paths(base_dir, league))
+    return league_data(load_player_pool(base_dir), league, base_dir, params)
+
+# --- HOT RELOAD: CHANGED INPUT FILES APPLIED TO LOADED DATA ---
+# Live sessions index the pool by PlayerId, so a refresh never reorders it: players
+# already in the pool keep their row and only get their new ADP/Stars/Rating (and the
+# Upside label that follows from ADP), players new to the files are appended, and
+# players gone from the files keep their row without an ADP. A refresh never ages a
+# player: a freshman stays a Freshman pick even when only the ADP list still has them,
+# since that happens at a season boundary (dynasty.next_pool). Only the score columns of
+# touched players are recomputed. A league whose own files changed is rebuilt over the
+# same pool, so its PlayerIds do not move either.
+PLAYER_VALUE_COLUMNS = ["ADP", "Stars", "Rating", "PickType"]
+
+def _same_values(a, b):
+    """Row-wise equality of two aligned pool slices, with missing == missing"""
+    same = np.ones(len(a), dtype=bool)
+    for col in PLAYER_VALUE_COLUMNS:
+        x, y = a[col].reset_index(drop=True), b[col].reset_index(drop=True)
+        same &= ((x == y).fillna(False) | (x.isna() & y.isna())).to_numpy(dtype=bool)
+    return same
+
+def merge_player_updates(players, base_dir="."):
+    """(pool, player_index, updated PlayerIds, added PlayerIds) after re-reading the ranking files"""
+    sources = load_player_sources(base_dir)
+    matcher = match_sources(sources, os.path.join(base_dir, PLAYER_IDS_FILE))
+    fresh, aliases = merge_sources(sources, matcher)
+    fresh = compact_pool(label_upside(fresh))
+    spellings = {}
+    for alias, kept in aliases.items():
+        spellings.setdefault(kept, []).append(alias)
+    ids = []
+    for name in fresh["NormPlayer"]:
+        known = [players.player_index[n] for n in [name] + spellings.get(name, []) if n in players.player_index]
+        ids.append(known[0] if known else -1)
+    ids = np.array(ids, dtype=np.int64)
+    matched = ids >= 0
+
+    # The refreshed values of every existing row: fresh ones where the files still list
+    # the player, otherwise the old values without ADP
+    current = players.pool.drop(columns="PlayerId").astype({col: object for col in POOL_CATEGORIES})
+    refreshed = current.copy()
+    gone = np.ones(len(current), dtype=bool)
+    gone[ids[matched]] = False
+    refreshed.loc[gone, "ADP"] = np.nan
+    for col in PLAYER_VALUE_COLUMNS:
+        refreshed.loc[ids[matched], col] = fresh.loc[matched, col].astype(current[col].dtype).to_numpy()
+    aged = (current["PickType"] == "Freshman") & (refreshed["PickType"] != "Freshman")
+    refreshed.loc[aged, "PickType"] = "Freshman"
+    refreshed = label_upside(refreshed)
+    updated = np.flatnonzero(~_same_values(current, refreshed))
+    added = fresh.loc[~matched, POOL_COLUMNS]
+    pool = compact_pool(pd.concat([refreshed, added], ignore_index=True))
+    added_ids = np.arange(len(current), len(pool))
+
+    player_index = dict(players.player_index)
+    for pos in added_ids:
+        player_index.setdefault(pool["NormPlayer"].iat[pos], int(pos))
+    player_index.update({a: player_index[k] for a, k in aliases.items() if a not in player_index and k in player_index})
+    return pool, player_index, updated, added_ids
+
+def refresh_player_pool(players, base_dir="."):
+    """(players, updated PlayerIds, added PlayerIds); players is returned as is when the
+    ranking files did not change"""
+    file_hashes = {name: file_hash(os.path.join(base_dir, name)) for name in RANKING_FILES}
+    if file_hashes == players.file_hashes:
+        return players, np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    pool, player_index, updated, added = merge_player_updates(players, base_dir)
+    return PlayerPool(pool, player_index, pool_features(pool), file_hashes), updated, added
+
+def rescore_players(data, pool, rows):
+    """Score matrices for pool where only the given rows (and appended rows) changed"""
+    n_old = data.scores.shape[1]
+    scores = np.zeros((len(data.score_rows), len(pool)), dtype=np.float32)
+    consensus_scores = np.zeros_like(scores)
+    scores[:, :n_old] = data.scores
+    consensus_scores[:, :n_old] = data.consensus_scores
+    rows = np.union1d(rows, np.arange(n_old, len(pool))).astype(np.int64)
+    if len(rows):
+        part = pool.iloc[rows]
+        for manager, r in data.score_rows.items():
+            pt_weights, pos_weights, col_weights, *_, profile, profile_type = data.compiled_profiles[manager]
+            scores[r, rows] = score_players(part, profile, params=data.params).to_numpy(dtype=np.float32)
+            consensus_scores[r, rows] = consensus_score(part, pos_weights, col_weights, data.params).to_numpy(dtype=np.float32)
+    scores.flags.writeable = False
+    consensus_scores.flags.writeable = False
+    return scores, consensus_scores
+
+def refresh_league(data, players, updated, added, base_dir="."):
+    """(data, changes) for a league after refresh_player_pool returned players.
+
+    changes is {} when nothing the league depends on changed, otherwise {"files",
+    "updated", "added", "rebuilt"}; rebuilt means the league's own files changed.
+    """
+    league = data.league or DEFAULT_LEAGUE
+    own = {name: file_hash(os.path.join(base_dir, name)) for name in league_files(league)}
+    file_hashes = dict(players.file_hashes, **own)
+    changed = sorted(name for name, h in file_hashes.items() if (data.file_hashes or {}).get(name) != h)
+    if not changed:
+        return data, {}
+    names = players.pool["Player"]
+    changes = {"files": changed, "updated": [names.iat[i] for i in updated], "added": [names.iat[i] for i in added], "rebuilt": False}
+    if any(data.file_hashes.get(name) != h for name, h in own.items()):
+        return league_data(players, league, base_dir, data.params), dict(changes, rebuilt=True)
+    scores, consensus_scores = rescore_players(data, players.pool, updated)
+    return data._replace(
+        pool=players.pool, player_index=players.player_index, scores=scores, consensus_scores=consensus_scores,
+        rules=compile_rules(data.rules.table, players.pool), version=input_version(file_hashes), file_hashes=file_hashes,
+    ), changes
+
+def refresh_data(data, base_dir="."):
+    """(data, changes) for a single league's input files as they are now"""
+    players = PlayerPool(data.pool, data.player_index, None, {name: data.file_hashes[name] for name in RANKING_FILES})
+    players, updated, added = refresh_player_pool(players, base_dir)
+    return refresh_league(data, players, updated, added, base_dir)
+
+def compatible_data(old, new):
+    """True when draft states built on old stay valid on new: same managers and slots, and
+    every PlayerId of old still names the same player"""
+    n = len(old.pool)
+    return (
+        old.score_rows == new.score_rows
+        and np.array_equal(old.plan.manager_ids, new.plan.manager_ids)
+        and len(new.pool) >= n
+        and bool((new.pool["NormPlayer"].to_numpy()[:n] == old.pool["NormPlayer"].to_numpy()).all())
+    )
+
+# --- PER-SESSION DRAFT STATE ---
+LEDGER_POSITIONS = {"QB": 0, "RB": 1, "WR": 2, "TE": 3}
+LEDGER_PICK_TYPES = {"Freshman": 0, "RTC": 1, "Upside": 2}
+
+class RosterLedger:
+    """Every manager's counters in two int16 arrays, positions[manager, position] and
+    pick_types[manager, pick type], plus the pool PlayerIds each manager took in pick order.
+
+    Rows follow the shared manager index (DraftData.score_rows); recording a pick and
+    every count query are O(1). carried[manager, position] optionally holds players kept
+    from earlier seasons (dynasty.py); they count in held() but not in this draft's roster.
+    """
+
+    def __init__(self, managers, positions=None, pick_types=None, players=None, carried=None):
+        self.managers = managers
+        self.positions = np.zeros((len(managers), len(LEDGER_POSITIONS)), dtype=np.int16) if positions is None else positions
+        self.pick_types = np.zeros((len(managers), len(LEDGER_PICK_TYPES)), dtype=np.int16) if pick_types is None else pick_types
+        self.players = [() for _ in managers] if players is None else players
+        self.carried = carried
+
+    def add(self, manager, player_id, position, pick_type):
+        m = self.managers[manager]
+        p = LEDGER_POSITIONS.get(position)
+        if p is not None:
+            self.positions[m, p] += 1
+        t = LEDGER_PICK_TYPES.get(pick_type)
+        if t is not None:
+            self.pick_types[m, t] += 1
+        self.players[m] = self.players[m] + (int(player_id),)   # tuples: copies share them
+
+    def count(self, manager, position):
+        return int(self.positions[self.managers[manager], LEDGER_POSITIONS[position]])
+
+    def type_count(self, manager, pick_type):
+        return int(self.pick_types[self.managers[manager], LEDGER_PICK_TYPES[pick_type]])
+
+    def roster(self, manager):
+        """{position: count} for manager (all zeros for a manager the ledger doesn't know)"""
+        m = self.managers.get(manager)
+        return {p: 0 if m is None else int(self.positions[m, i]) for p, i in LEDGER_POSITIONS.items()}
+
+    def held(self, manager):
+        """roster() plus the players carried over from earlier seasons"""
+        roster = self.roster(manager)
+        m = self.managers.get(manager)
+        if self.carried is None or m is None:
+            return roster
+        return {p: n + int(self.carried[m, LEDGER_POSITIONS[p]]) for p, n in roster.items()}
+
+    def type_counts(self, manager):
+        m = self.managers.get(manager)
+        return {t: 0 if m is None else int(self.pick_types[m, i]) for t, i in LEDGER_PICK_TYPES.items()}
+
+    def drafted(self, manager):
+        """PlayerIds manager has drafted, in pick order"""
+        m = self.managers.get(manager)
+        return () if m is None else self.players[m]
+
+    def copy(self):
+        return RosterLedger(
+            self.managers, self.positions.copy(), self.pick_types.copy(), list(self.players), self.carried
+        )
+
+    def key(self):
+        key = self.positions.tobytes() + self.pick_types.tobytes()
+        return key if self.carried is None else key + self.carried.tobytes()
+
+@dataclass
+class DraftState:
+    """The only mutable part of a draft: which pool rows are gone, the roster ledger and the
+    pick log (draft_results, not kept when log is False)"""
+    available: np.ndarray
+    ledger: RosterLedger
+    draft_results: list = field(default_factory=list)
+    current_pick_idx: int = 0
+    pick_number: int = 0
+    log: bool = True
+
+def new_draft_state(data):
+    return DraftState(available=np.ones(len(data.pool), dtype=bool), ledger=RosterLedger(data.score_rows))
+
+def extend_draft_state(data, state):
+    """Make room in state for players appended to the pool by refresh_data (they are available)"""
+    extra = len(data.pool) - len(state.available)
+    if extra > 0:
+        state.available = np.concatenate([state.available, np.ones(extra, dtype=bool)])
+
+def fork_draft_state(state, log=True):
+    """Cheap copy for what-if simulations: ledger and mask are copied, the pick log is not
+    (and with log=False the fork keeps none of its own)"""
+    return DraftState(
+        available=state.available.copy(),
+        ledger=state.ledger.copy(),
+        current_pick_idx=state.current_pick_idx,
+        pick_number=state.pick_number,
+        log=log,
+    )
+
+class DraftSnapshot(NamedTuple):
+    """A draft state frozen once for many forks: read-only mask and counters, rosters as
+    tuples and no pick log, so it is safe to share between threads and small to pickle"""
+    available: np.ndarray
+    positions: np.ndarray
+    pick_types: np.ndarray
+    players: tuple
+    carried: np.ndarray
+    current_pick_idx: int
+    pick_number: int
+
+def _frozen(a):
+    a = a.copy()
+    a.flags.writeable = False
+    return a
+
+def snapshot_draft_state(state):
+    ledger = state.ledger
+    return DraftSnapshot(
+        _frozen(state.available), _frozen(ledger.positions), _frozen(ledger.pick_types), tuple(ledger.players),
+        ledger.carried, state.current_pick_idx, state.pick_number,
+    )
+
+def fork_snapshot(data, snapshot, log=False):
+    """DraftState continuing from snapshot. Only the mask and the counter arrays are copied
+    (a few hundred bytes); rosters are shared tuples, so a fork costs the same however late
+    in the draft it starts and simulating it costs only the remaining picks."""
+    ledger = RosterLedger(
+        data.score_rows, snapshot.positions.copy(), snapshot.pick_types.copy(), list(snapshot.players), snapshot.carried
+    )
+    return DraftState(
+        snapshot.available.copy(), ledger, current_pick_idx=snapshot.current_pick_idx,
+        pick_number=snapshot.pick_number, log=log,
+    )
+
+def available_players(data, state):
+    return data.pool[state.available]
+
+def drafted_players(data, state):
+    return set(data.pool["NormPlayer"][~state.available])
+
+def record_player(data, state, manager, player_id):
+    """record_pick without the pick log entry (and without fetching the pool row)"""
+    state.available[player_id] = False
+    state.ledger.add(manager, player_id, data.pool["Position"].iat[player_id], data.pool["PickType"].iat[player_id])
+
+def record_pick(data, state, manager, round_num, overall_pick, row, explanation):
+    player_id = data.player_index[row["NormPlayer"]]
+    state.available[player_id] = False
+    state.ledger.add(manager, player_id, row["Position"], row["PickType"])
+    if not state.log:
+        return
+    state.draft_results.append({
+        "Round": round_num,
+        "Manager": manager,
+        "Overall Pick": overall_pick,
+        "Player": row["Player"],
+        "Position": row["Position"],
+        "College": row["College"],
+        "PickType": row["PickType"],
+        "Stars": row.get("Stars", ""),
+        "Rating": row.get("Rating", ""),
+        "ADP": row.get("ADP", ""),
+        "Explanation": explanation
+    })
+
+def record_empty_pick(state, round_num, overall_pick, manager, player, explanation):
+    if not state.log:
+        return
+    state.draft_results.append({
+        "Round": round_num,
+        "Manager": manager,
+        "Overall Pick": overall_pick,
+        "Player": player,
+        "Position": "",
+        "College": "",
+        "PickType": "",
+        "Stars": "",
+        "Rating": "",
+        "ADP": "",
+        "Explanation": explanation
+    })
+
+def pick_plan(data, state, idx):
+    """Everything that decides the pick at idx except the random draw.
+
+    Returns a dict with manager, round_num, overall_pick, the ordered stages
+    [(branch, candidate pool positions, outlier)] from the rule table, the score array
+    they are ranked by and the arguments human_explain_pick needs. Empty-manager slots
+    have no stages.
+    """
+    manager, round_num, overall_pick = slot_info(data.plan, idx)
+    plan = {"manager": manager, "round_num": round_num, "overall_pick": overall_pick, "stages": [], "top_n": data.params.top_n}
+    if manager == "":
+        return plan
+    pt_weights, pos_weights, col_weights, quota_fresh, quota_upside, quota_rtc, rtc_lock, profile, profile_type = data.compiled_profiles[manager]
+    quotas = {"Freshman": quota_fresh, "Upside": quota_upside, "RTC": quota_rtc}
+    counts = state.ledger.type_counts(manager)
+    ctx = pick_context(
+        manager, round_num, idx, quotas, counts, rtc_lock, profile, state.ledger.roster(manager), data.params,
+        state.ledger.held(manager)
+    )
+    stages, options = rule_stages(data.rules, ctx, state.available)
+    score = data.scores[data.score_rows[manager]]
+    consensus = data.consensus_scores[data.score_rows[manager]]
+    plan.update(
+        stages=stages, score=score, profile=profile, profile_type=profile_type,
+        quotas=quotas, counts=counts, rtc_lock=rtc_lock,
+        stage_scores={b: consensus for b, rule in options.items() if rule.get("score") == "consensus"},
+        stage_explain={b: stage_explain_args(rule, quotas, counts, rtc_lock) for b, rule in options.items() if rule.get("explain")},
+    )
+    return plan
+
+# --- PICK TRACE ---
+def trace_pick(data, plan, branch, pos, outlier):
+    """Log the decision behind a drawn pick on pick_log: the stages that came up empty, the
+    branch taken, its top-n window and the draw"""
+    empty, candidates = [], []
+    for b, cands, _ in plan["stages"]:
+        if b == branch:
+            candidates = cands
+            break
+        empty.append(b)
+    score = plan.get("stage_scores", {}).get(branch, plan["score"])
+    window = rank_candidates(candidates, score)[:plan["top_n"]]
+    names = data.pool["Player"]
+    decision = {
+        "Overall Pick": plan["overall_pick"], "Round": plan["round_num"], "Manager": plan["manager"],
+        "Branch": branch, "Empty Stages": empty, "Outlier": outlier, "Eligible": len(candidates),
+        "Window": [names.iat[i] for i in window], "Window Scores": [round(float(score[i]), 4) for i in window],
+        "Drawn": names.iat[pos],
+    }
+    pick_log.debug(
+        "Pick %s %s: %s drew %s from %s", plan["overall_pick"], plan["manager"], branch, decision["Drawn"],
+        decision["Window"], extra={"pick": decision}
+    )
+
+class PickTraceBuffer(logging.Handler):
+    """Ring buffer of the last maxlen pick decisions logged on pick_log"""
+
+    def __init__(self, maxlen=200):
+        super().__init__(logging.DEBUG)
+        self.decisions = deque(maxlen=maxlen)
+
+    def emit(self, record):
+        decision = getattr(record, "pick", None)
+        if decision is not None:
+            self.decisions.append(decision)
+
+    def recent(self, n=50):
+        return list(self.decisions)[-n:]
+
+def attach_pick_trace(maxlen=200):
+    """Start tracing explained picks into a new ring buffer; returns the buffer"""
+    buffer = PickTraceBuffer(maxlen)
+    pick_log.addHandler(buffer)
+    pick_log.setLevel(logging.DEBUG)
+    return buffer
+
+def record_skipped_slot(data, state, idx):
+    """Log the comp/empty slot idx (data.plan.skip) in the pick log"""
+    manager, round_num, overall_pick = slot_info(data.plan, idx)
+    record_empty_pick(state, round_num, overall_pick, manager, "Pick Skipped", "Skipped pick (comp/empty in draft order).")
+
+def simulate_next_pick(data, state, idx, explain=True, rng=None):
+    """Simulate and record the pick at idx; returns (branch, pool position, score) of the
+    drawn player, or (None, -1, nan) for skipped and empty picks. Seeded simulations on
+    threads pass their own rng (see sample_top) so they never share the global one."""
+    if data.plan.skip[idx]:
+        record_skipped_slot(data, state, idx)
+        return None, -1, float("nan")
+    plan = pick_plan(data, state, idx)
+    manager, round_num, overall_pick = plan["manager"], plan["round_num"], plan["overall_pick"]
+    drawn = draw_from_stages(plan["stages"], plan.get("score"), plan.get("stage_scores"), plan["top_n"], rng)
+    if drawn is None:
+        record_empty_pick(state, round_num, overall_pick, manager, "No eligible players left", "No eligible players")
+        return None, -1, float("nan")
+    branch, pos, outlier = drawn
+    if explain and pick_log.isEnabledFor(logging.DEBUG):
+        trace_pick(data, plan, branch, pos, outlier)
+    score = float(plan.get("stage_scores", {}).get(branch, plan["score"])[pos])
+    if not explain and not state.log:
+        record_player(data, state, manager, pos)
+        return branch, pos, score
+    pick_row_out = data.pool.iloc[pos]
+    quotas, counts, rtc_lock = plan.get("stage_explain", {}).get(branch, (plan.get("quotas"), plan.get("counts"), plan.get("rtc_lock")))
+    expl = human_explain_pick(
+        manager, pick_row_out, round_num, plan["profile_type"], outlier, False,
+        quotas, counts, rtc_lock, plan["profile"], current_year="2025"
+    ) if explain else ""
+    record_pick(data, state, manager, round_num, overall_pick, pick_row_out, expl)
+    return branch, pos, score
@@ -0,0 +1,183 @@
+# --- DRAFT ROOM: ONE AUTHORITATIVE DRAFT SHARED BY SEVERAL HUMAN MANAGERS ---
+
+import threading
+import time
+from draft_engine import (
+    new_draft_state, simulate_next_pick, record_pick, record_empty_pick, slot_info,
+    compatible_data, extend_draft_state
+)
+
+# A human's team goes back to the CPU once their session has not checked in for this long
+# (closed tab, lost connection); the same session token can claim it again afterwards
+CLAIM_TIMEOUT = 30.0
+# Rooms in which no human has checked in for this long are dropped by the broker
+ROOM_IDLE_TIMEOUT = 3600.0
+
+class DraftRoom:
+    """Owns the authoritative DraftState and an ordered pick event log.
+
+    Sessions never mutate the room state directly: they submit picks or ask the room to
+    run CPU picks, then replay the events they have not seen yet onto their own replica.
+    CPU picks are therefore simulated once per room, not once per viewer.
+    """
+
+    def __init__(self, data, room_id, claim_timeout=CLAIM_TIMEOUT):
+        self.data = data
+        self.room_id = room_id
+        self.claim_timeout = claim_timeout
+        self.state = new_draft_state(data)
+        self.events = []
+        self.humans = {}   # team -> (session_id, last check-in on the monotonic clock)
+        self.last_seen = time.monotonic()
+        self._lock = threading.RLock()
+
+    # --- membership ---
+    def claim_team(self, team, session_id):
+        """Claim team for session_id, or check in on a claim it already holds. Sessions
+        call this on every refresh; a claim that has not checked in for claim_timeout
+        seconds may be taken over by another session."""
+        now = time.monotonic()
+        with self._lock:
+            owner = self.humans.get(team)
+            if owner is not None and owner[0] != session_id and now - owner[1] < self.claim_timeout:
+                return False
+            self.humans[team] = (session_id, now)
+            self.last_seen = now
+            return True
+
+    def release_team(self, team, session_id):
+        with self._lock:
+            owner = self.humans.get(team)
+            if owner is not None and owner[0] == session_id:
+                del self.humans[team]
+
+    def human_teams(self):
+        """Teams held by a session that is still checking in"""
+        with self._lock:
+            self._expire_claims()
+            return set(self.humans)
+
+    def _expire_claims(self):
+        now = time.monotonic()
+        for team, (_, seen) in list(self.humans.items()):
+            if now - seen >= self.claim_timeout:
+                del self.humans[team]
+
+    def use_data(self, data):
+        """Carry on with refreshed player data (compatible_data(self.data, data) must hold)"""
+        with self._lock:
+            extend_draft_state(data, self.state)
+            self.data = data
+
+    # --- picks ---
+    def current_manager(self):
+        with self._lock:
+            if self.state.current_pick_idx >= len(self.data.draft_order):
+                return None
+            return slot_info(self.data.plan, self.state.current_pick_idx)[0]
+
+    def submit_pick(self, team, norm_player, explanation="Manual pick."):
+        """Record a human pick if it is that team's turn and the player is still on the board"""
+        with self._lock:
+            idx = self.state.current_pick_idx
+            if idx >= len(self.data.draft_order):
+                raise ValueError("The draft is already complete.")
+            manager, round_num, overall_pick = slot_info(self.data.plan, idx)
+            if manager != team:
+                raise ValueError(f"{team} is not on the clock ({manager or 'skipped pick'} is).")
+            row_pos = self.data.player_index.get(norm_player)
+            if row_pos is None or not self.state.available[row_pos]:
+                raise ValueError(f"{norm_player} is no longer available.")
+            row = self.data.pool.iloc[row_pos]
+            record_pick(self.data, self.state, manager, round_num, overall_pick, row, explanation)
+            return self._publish(idx, norm_player)
+
+    def sim_next(self):
+        """Simulate the pick on the clock unless a human in the room owns it"""
+        with self._lock:
+            idx = self.state.current_pick_idx
+            if idx >= len(self.data.draft_order):
+                return None
+            manager = slot_info(self.data.plan, idx)[0]
+            if manager and manager in self.human_teams():
+                return None
+            return self._append(sim_pick_event(self.data, self.state, len(self.events) + 1))
+
+    def _publish(self, idx, norm_player):
+        self.state.current_pick_idx += 1
+        self.state.pick_number += 1
+        return self._append(pick_event(self.state, len(self.events) + 1, idx, norm_player))
+
+    def _append(self, event):
+        self.events.append(event)
+        return event
+
+    # --- subscription ---
+    def events_since(self, seq):
+        with self._lock:
+            return self.events[seq:]
+
+
+def pick_event(state, seq, idx, norm_player):
+    """Event for the pick just recorded at idx (the last entry of state.draft_results)"""
+    return {"seq": seq, "pick_idx": idx, "norm_player": norm_player, "result": dict(state.draft_results[-1])}
+
+def sim_pick_event(data, state, seq, rng=None):
+    """Simulate the pick on the clock, advance the state and return the pick as an event"""
+    idx = state.current_pick_idx
+    branch, pos, score = simulate_next_pick(data, state, idx, rng=rng)
+    norm_player = data.pool["NormPlayer"].iat[pos] if pos >= 0 else None
+    state.current_pick_idx += 1
+    state.pick_number += 1
+    return pick_event(state, seq, idx, norm_player)
+
+def apply_event(data, state, event):
+    """Replay one room event onto a session replica of the draft state"""
+    if event["pick_idx"] != state.current_pick_idx:
+        raise ValueError(f"Out-of-order event {event['seq']}: replica is at pick {state.current_pick_idx}.")
+    result = event["result"]
+    if event["norm_player"] is None:
+        record_empty_pick(state, result["Round"], result["Overall Pick"], result["Manager"], result["Player"], result["Explanation"])
+    else:
+        row = data.pool.iloc[data.player_index[event["norm_player"]]]
+        record_pick(data, state, result["Manager"], result["Round"], result["Overall Pick"], row, result["Explanation"])
+    state.current_pick_idx += 1
+    state.pick_number += 1
+
+# --- IN-PROCESS BROKER ---
+_rooms = {}
+_rooms_lock = threading.Lock()
+
+def _room_key(data, room_id):
+    # Leagues share a process, so the same room name in two leagues is two rooms
+    return (data.league.league_id if data.league is not None else "", str(room_id).strip().upper())
+
+def get_room(data, room_id):
+    key = _room_key(data, room_id)
+    room_id = key[1]
+    with _rooms_lock:
+        _drop_idle_rooms()
+        room = _rooms.get(key)
+        if room is None or (room.data is not data and not compatible_data(room.data, data)):
+            room = _rooms[key] = DraftRoom(data, room_id)
+        elif room.data is not data:
+            room.use_data(data)
+        return room
+
+def leave_room(data, room_id, team, session_id):
+    """Release session_id's claim on team; the room closes once no human holds a team in it"""
+    key = _room_key(data, room_id)
+    with _rooms_lock:
+        room = _rooms.get(key)
+        if room is None:
+            return
+        room.release_team(team, session_id)
+        if not room.human_teams():
+            del _rooms[key]
+
+def _drop_idle_rooms():
+    # Sessions that vanish without leaving never call leave_room; their rooms go here
+    now = time.monotonic()
+    for key, room in list(_rooms.items()):
+        if now - room.last_seen >= ROOM_IDLE_TIMEOUT and not room.human_teams():
+            del _rooms[key]
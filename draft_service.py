@@ -0,0 +1,361 @@
+# --- DRAFT SERVICE: LOCAL HTTP/JSON API OVER A WARM ENGINE ---
+#
+# Stdlib only. The data is loaded once by the server and published to the worker
+# processes through shared memory. "picks" is the pick log so far: one player name (or null for a
+# skipped slot) per draft order slot, from the first pick on.
+#   GET  /health
+#   POST /simulate      {"picks": [...], "seeds": [0, 1], "until_pick": null}
+#   POST /availability  {"picks": [...], "at_pick": 40, "players": null, "top": 25}
+#                       "method": "sim" simulates instead, until every answer is within
+#                       +-"precision" (default 0.05) or "time_budget" runs out, and adds
+#                       Low/High bounds per player plus the number of drafts run
+#   POST /recommend     {"picks": [...], "team": "MANAGER", "time_budget": 2.0}
+# Requests for the same pick log that arrive within --window seconds run as one batch:
+# simulations share one worker task, availability queries share one probability matrix,
+# and identical requests (also ones still running) share one result.
+# Usage: python draft_service.py --port 8765 --workers 4
+
+import argparse
+import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pandas as pd
+from draft_engine import (
+    load_data, new_draft_state, fork_snapshot, snapshot_draft_state, simulate_next_pick, record_pick, record_empty_pick,
+    record_skipped_slot, normalize_name, slot_info
+)
+from leagues import read_leagues
+from pick_probabilities import availability_at, pick_probability_matrix
+from recommender import recommend
+from shared_data import SharedDraftData, attach_data
+from sim_results import project_availability
+
+log = logging.getLogger(__name__)
+
+def replay_picks(data, picks):
+    """Draft state after the pick log; raises ValueError for a player who is unknown or gone"""
+    state = new_draft_state(data)
+    n_slots = len(data.plan.manager_ids)
+    if len(picks) > n_slots:
+        raise ValueError(f"{len(picks)} picks but the draft has {n_slots} slots.")
+    for player in picks:
+        idx = state.current_pick_idx
+        manager, round_num, overall_pick = slot_info(data.plan, idx)
+        if data.plan.skip[idx]:
+            record_skipped_slot(data, state, idx)
+        elif player is None:
+            record_empty_pick(state, round_num, overall_pick, manager, "No pick made", "No pick made.")
+        else:
+            pos = data.player_index.get(normalize_name(player))
+            if pos is None:
+                raise ValueError(f"Unknown player: {player}")
+            if not state.available[pos]:
+                raise ValueError(f"{player} was already drafted before pick {overall_pick}.")
+            record_pick(data, state, manager, round_num, overall_pick, data.pool.iloc[pos], "Logged pick.")
+        state.current_pick_idx += 1
+        state.pick_number += 1
+    return state
+
+def clean_json(obj):
+    """numpy/pandas values to plain JSON types (NaN and NA become null)"""
+    if isinstance(obj, dict):
+        return {str(k): clean_json(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [clean_json(v) for v in obj]
+    if isinstance(obj, (bool, np.bool_)):
+        return bool(obj)
+    if isinstance(obj, (int, np.integer)):
+        return int(obj)
+    if isinstance(obj, (float, np.floating)):
+        if math.isnan(obj):
+            return None
+        # float32 pool columns would otherwise print as 0.9980999827384949
+        return round(float(obj), 6) if isinstance(obj, np.float32) else float(obj)
+    if obj is None or obj is pd.NA:
+        return None
+    if isinstance(obj, str):
+        return obj
+    return str(obj)
+
+# --- WORKERS: every process attaches to the data the server published ---
+_worker_data = None
+
+def _init_worker(handle):
+    global _worker_data
+    _worker_data = attach_data(handle)
+
+def _ping():
+    return os.getpid()
+
+def _simulate_batch(picks, until_idx, seeds):
+    """The rest of the draft (up to until_idx) once per seed, from one replayed state"""
+    data = _worker_data
+    base = snapshot_draft_state(replay_picks(data, picks))
+    end = len(data.draft_order) if until_idx is None else min(until_idx, len(data.draft_order))
+    out = []
+    for seed in seeds:
+        rng = np.random.RandomState(seed)
+        state = fork_snapshot(data, base, log=True)
+        while state.current_pick_idx < end:
+            simulate_next_pick(data, state, state.current_pick_idx, explain=False, rng=rng)
+            state.current_pick_idx += 1
+            state.pick_number += 1
+        out.append(clean_json([{k: v for k, v in r.items() if k != "Explanation"} for r in state.draft_results]))
+    return out
+
+def _player_rows(data, state, players, top, survival):
+    if players:
+        return [data.player_index[normalize_name(p)] for p in players if normalize_name(p) in data.player_index]
+    # Most likely to be gone first; players who are sure to be there say little
+    return [int(i) for i in np.argsort(survival, kind="stable") if state.available[i]][:top]
+
+def _player_json(data, i, **values):
+    return clean_json({
+        "Player": data.pool["Player"].iat[i], "NormPlayer": data.pool["NormPlayer"].iat[i],
+        "Position": data.pool["Position"].iat[i], "PickType": data.pool["PickType"].iat[i], **values,
+    })
+
+def _availability_batch(picks, queries):
+    """queries: [(target_idx, players or None, top)]; one probability matrix covers them all"""
+    data = _worker_data
+    state = replay_picks(data, picks)
+    start = state.current_pick_idx
+    n_picks = max([t - start for t, _, _ in queries] + [0])
+    _, matrix = pick_probability_matrix(data, state, n_picks)
+    taken = np.vstack([np.zeros(len(state.available)), np.cumsum(matrix, axis=0)])
+    out = []
+    for target_idx, players, top in queries:
+        survival = np.clip(state.available - taken[min(max(target_idx - start, 0), len(taken) - 1)], 0.0, 1.0)
+        rows = _player_rows(data, state, players, top, survival)
+        out.append({"players": [_player_json(data, i, Available=round(float(survival[i]), 4)) for i in rows]})
+    return out
+
+def _project(picks, target_idx, players, top, precision, time_budget):
+    """Simulated availability with Wilson error bars (project_availability); without a
+    player list the players are chosen like the analytic query does"""
+    data = _worker_data
+    state = replay_picks(data, picks)
+    if players:
+        rows = _player_rows(data, state, players, top, None)
+    else:
+        rows = _player_rows(data, state, None, top, availability_at(data, state, target_idx))
+    projection = project_availability(data, state, target_idx, rows, precision=precision, time_budget=time_budget)
+    return {
+        "players": [
+            _player_json(data, i, Available=round(float(e), 4), Low=round(float(lo), 4), High=round(float(hi), 4))
+            for i, e, lo, hi in zip(projection.rows, projection.estimate, projection.low, projection.high)
+        ],
+        "sims": projection.sims, "seconds": round(projection.seconds, 3), "converged": projection.converged,
+    }
+
+def _recommend(picks, team, time_budget):
+    data = _worker_data
+    return clean_json(recommend(data, replay_picks(data, picks), team, time_budget=time_budget))
+
+class Batcher:
+    """Groups requests by key for window seconds and hands each group to run_batch(key, items),
+    which returns one result per item. Equal items share one Future, including items that
+    are still running in an earlier batch."""
+
+    def __init__(self, run_batch, window=0.02):
+        self.run_batch = run_batch
+        self.window = window
+        self._lock = threading.Lock()
+        self._pending = {}   # key -> {item: Future}, not started yet
+        self._running = {}   # (key, item) -> Future
+
+    def submit(self, key, item):
+        with self._lock:
+            future = self._running.get((key, item))
+            if future is not None:
+                return future
+            group = self._pending.get(key)
+            if group is None:
+                group = self._pending[key] = {}
+                timer = threading.Timer(self.window, self._flush, (key,))
+                timer.daemon = True
+                timer.start()
+            if item not in group:
+                group[item] = Future()
+            return group[item]
+
+    def _flush(self, key):
+        with self._lock:
+            group = self._pending.pop(key)
+            for item, future in group.items():
+                self._running[(key, item)] = future
+        items = list(group)
+        try:
+            for item, result in zip(items, self.run_batch(key, items)):
+                group[item].set_result(result)
+        except Exception as e:
+            for future in group.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                for item in items:
+                    self._running.pop((key, item), None)
+
+class DraftService:
+    """The warm engine behind the HTTP handler; also usable directly from Python"""
+
+    def __init__(self, base_dir=".", workers=None, window=0.02, league_id=None):
+        leagues = read_leagues(base_dir)
+        league = leagues[league_id] if league_id else next(iter(leagues.values()))
+        self.data = load_data(base_dir, league=league)
+        self.workers = workers or os.cpu_count() or 1
+        self.shared = SharedDraftData(self.data)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.shared.handle,))
+        # Start every worker now so the first requests don't pay for loading the data
+        for f in [self.pool.submit(_ping) for _ in range(self.workers)]:
+            f.result()
+        self.batcher = Batcher(self._run_batch, window)
+
+    def _run_batch(self, key, items):
+        kind, picks = key[0], key[1]
+        if kind == "simulate":
+            # Split the seeds over the workers, one task each
+            chunks = [items[i::self.workers] for i in range(min(self.workers, len(items)))]
+            futures = [self.pool.submit(_simulate_batch, picks, key[2], chunk) for chunk in chunks]
+            by_seed = {}
+            for chunk, future in zip(chunks, futures):
+                by_seed.update(zip(chunk, future.result()))
+            return [by_seed[seed] for seed in items]
+        if kind == "availability":
+            return self.pool.submit(_availability_batch, picks, items).result()
+        if kind == "project":
+            futures = [self.pool.submit(_project, picks, *item) for item in items]
+            return [f.result() for f in futures]
+        if kind == "recommend":
+            futures = [self.pool.submit(_recommend, picks, key[2], budget) for budget in items]
+            return [f.result() for f in futures]
+        raise ValueError(f"Unknown batch kind: {kind}")
+
+    def _picks(self, body):
+        picks = body.get("picks", [])
+        if not isinstance(picks, list):
+            raise ValueError("picks must be a list of player names (null for skipped slots).")
+        picks = tuple(None if p is None else normalize_name(str(p)) for p in picks)
+        replay_picks(self.data, picks)   # reject a bad log here rather than in a worker
+        return picks
+
+    def _pick_idx(self, overall_pick):
+        idx = int(overall_pick) - 1
+        if not 0 <= idx <= len(self.data.draft_order):
+            raise ValueError(f"Pick {overall_pick} is outside the draft (1-{len(self.data.draft_order)}).")
+        return idx
+
+    def simulate(self, body):
+        picks = self._picks(body)
+        seeds = body.get("seeds", [body.get("seed", 0)])
+        until = body.get("until_pick")
+        until_idx = None if until is None else self._pick_idx(until)
+        futures = [self.batcher.submit(("simulate", picks, until_idx), int(seed)) for seed in seeds]
+        return {"drafts": [{"seed": int(seed), "picks": f.result()} for seed, f in zip(seeds, futures)]}
+
+    def availability(self, body):
+        picks = self._picks(body)
+        target_idx = self._pick_idx(body["at_pick"])
+        players = body.get("players") or []
+        if not isinstance(players, list) or not all(isinstance(p, str) for p in players):
+            raise ValueError("players must be a list of player names.")
+        players = tuple(players)
+        top = int(body.get("top", 25))
+        method = body.get("method", "exact")
+        if method == "exact":
+            result = self.batcher.submit(("availability", picks), (target_idx, players or None, top)).result()
+        elif method == "sim":
+            item = (target_idx, players, top, float(body.get("precision", 0.05)), float(body.get("time_budget", 2.0)))
+            result = self.batcher.submit(("project", picks), item).result()
+        else:
+            raise ValueError(f"Unknown availability method: {method} (exact or sim)")
+        return {"at_pick": int(body["at_pick"]), **result}
+
+    def recommend(self, body):
+        picks = self._picks(body)
+        team = normalize_name(body["team"])
+        if team not in self.data.compiled_profiles:
+            raise ValueError(f"Unknown team: {body['team']}")
+        budget = float(body.get("time_budget", 2.0))
+        return {"team": team, "candidates": self.batcher.submit(("recommend", picks, team), budget).result()}
+
+    def health(self):
+        return {"status": "ok", "picks": len(self.data.draft_order), "players": len(self.data.pool), "workers": self.workers}
+
+    def close(self):
+        self.pool.shutdown()
+        self.shared.close()
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    service = None
+    routes = {"/simulate": "simulate", "/availability": "availability", "/recommend": "recommend"}
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.info("%s %s", self.address_string(), format % args)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        else:
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        method = self.routes.get(self.path)
+        if method is None:
+            self._send(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("The request body must be a JSON object.")
+            self._send(200, getattr(self.service, method)(body))
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            log.exception("%s failed", self.path)
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+
+def serve(service, host="127.0.0.1", port=8765):
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mock drafts, availability and recommendations over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--window", type=float, default=0.02, help="seconds to collect requests into one batch")
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--league", default=None, help="league id from leagues.json (default: the first)")
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    service = DraftService(args.base_dir, args.workers, args.window, args.league)
+    server = serve(service, args.host, args.port)
+    log.info("Draft service on http://%s:%s (%s workers)", args.host, args.port, service.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    main()
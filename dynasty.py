@@ -0,0 +1,241 @@
+# --- DYNASTY: CONSECUTIVE SEASONS WITH CARRIED-OVER ROSTERS AND EVOLVING PROFILES ---
+#
+# A trajectory drafts the 2025 pool, then keeps going one season at a time:
+#   - the pool ages: drafted players leave it, undrafted freshmen become RTC/Upside
+#     picks, players run out of eligibility after max_years, and a new freshman class
+#     arrives ("<year> 247 FRESHMAN RANK.csv" when the file exists, otherwise a synthetic
+#     class resampled from the 2025 freshmen); "<year> ADP DATA.csv" refreshes ADP;
+#   - rosters carry over: last season's picks (roster_seasons of them, while still
+#     eligible) count toward the drafted_* position-need conditions of the pick rules; the
+#     roster_* caps were fitted to a single draft and keep counting this season only;
+#   - profiles learn: each manager's simulated picks become its latest picktype_by_year
+#     (next season's quotas) and pull its pick type and position weights toward them.
+# Every later season is derived in memory from the shared first-season DraftData (same
+# draft order, plan and rules table), so workers never reload the input files.
+# Usage: python dynasty.py --trajectories 200 --seasons 3
+
+import argparse
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from draft_engine import (
+    LEDGER_POSITIONS, POOL_CATEGORIES, POOL_COLUMNS, build_score_matrices, compact_pool, compile_profiles,
+    compile_rules, label_upside, load_data, new_draft_state, normalize_name, read_adp_file,
+    read_freshman_file, simulate_next_pick
+)
+from shared_data import SharedDraftData, attach_data
+
+FIRST_SEASON = 2025
+PROFILE_PICK_TYPES = {"Freshman": "Freshman", "RTC": "Ready to Contribute", "Upside": "Upside"}
+RESULT_COLUMNS = ["Round", "Manager", "Overall Pick", "Player", "Position", "College", "PickType", "Stars", "Rating", "ADP"]
+
+def season_files(year):
+    return f"{year} 247 FRESHMAN RANK.csv", f"{year} ADP DATA.csv"
+
+def load_future_classes(base_dir, seasons):
+    """{year: (freshman frame or None, ADP frame or None)} for the seasons after the first"""
+    classes = {}
+    for year in range(FIRST_SEASON + 1, FIRST_SEASON + seasons):
+        paths = [os.path.join(base_dir, name) for name in season_files(year)]
+        classes[year] = (
+            read_freshman_file(paths[0]) if os.path.exists(paths[0]) else None,
+            read_adp_file(paths[1]) if os.path.exists(paths[1]) else None,
+        )
+    return classes
+
+# --- POOL AGING ---
+def pool_frame(pool):
+    """Plain pool columns (no categories, float stars) that later seasons can concatenate"""
+    frame = pool.reindex(columns=POOL_COLUMNS).astype({col: object for col in POOL_CATEGORIES})
+    return frame.astype({"Stars": np.float64, "ADP": np.float64, "Rating": np.float64})
+
+def synthetic_class(template, year, rating_noise=0.005):
+    """A freshman class resampled from template with jittered ratings, ranked and named by year"""
+    rows = template.sample(n=len(template), replace=True).reset_index(drop=True)
+    rows["Rating"] = np.clip(rows["Rating"] + np.random.normal(0.0, rating_noise, len(rows)), 0.0, 1.0)
+    rows = rows.sort_values("Rating", ascending=False, kind="stable").reset_index(drop=True)
+    rows["Player"] = [f"{year} Prospect {i + 1:03d}" for i in range(len(rows))]
+    rows["NormPlayer"] = rows["Player"].apply(normalize_name)
+    rows["ADP"] = np.nan
+    return rows
+
+def next_pool(frame, years, drafted, rostered, year, template, classes, max_years):
+    """(frame, years) for the next season: the undrafted players one year older, minus the
+    ones out of eligibility, plus the incoming class; years counts seasons in college.
+    rostered holds every NormPlayer drafted so far, which ranking files still list."""
+    keep = ~drafted & (years + 1 < max_years)
+    frame, years = frame[keep].copy(), years[keep] + 1
+    frame.loc[frame["PickType"].isin(["Freshman", "Upside"]), "PickType"] = "RTC"
+    freshmen, adp = classes.get(year, (None, None))
+    if adp is not None:
+        refreshed = frame["NormPlayer"].map(dict(zip(adp["NormPlayer"], adp["ADP"])))
+        frame["ADP"] = refreshed.where(refreshed.notna(), frame["ADP"])
+        newcomers = adp[~adp["NormPlayer"].isin(frame["NormPlayer"]) & ~adp["NormPlayer"].isin(rostered)]
+        frame = pd.concat([frame, pool_frame(newcomers)], ignore_index=True)
+        years = np.concatenate([years, np.ones(len(newcomers), dtype=years.dtype)])
+    frame = label_upside(frame.reset_index(drop=True))
+    incoming = pool_frame(freshmen) if freshmen is not None else synthetic_class(template, year)
+    incoming = incoming[~incoming["NormPlayer"].isin(frame["NormPlayer"]) & ~incoming["NormPlayer"].isin(rostered)]
+    frame = pd.concat([frame, incoming], ignore_index=True)
+    years = np.concatenate([years, np.zeros(len(incoming), dtype=years.dtype)])
+    frame["Years"] = years
+    frame = frame.drop_duplicates("NormPlayer").sort_values(["NormPlayer", "PickType"]).reset_index(drop=True)
+    return frame.drop(columns="Years"), frame["Years"].to_numpy()
+
+# --- PROFILE UPDATES ---
+def blend_weights(weights, counts, learning_rate):
+    """Move weights toward the observed shares in counts, keeping their total"""
+    n = sum(counts.values())
+    if n == 0:
+        return dict(weights)
+    total = sum(weights.values())
+    return {k: (1 - learning_rate) * weights.get(k, 0) + learning_rate * total * counts.get(k, 0) / n
+            for k in set(weights) | set(counts)}
+
+def update_profile(profile, picks, year, learning_rate):
+    """profile for the next season after a season of picks ([(pick type, position)])"""
+    types = Counter(PROFILE_PICK_TYPES[t] for t, _ in picks if t in PROFILE_PICK_TYPES)
+    positions = Counter(p for _, p in picks if p in LEDGER_POSITIONS)
+    simprof = dict(profile.get("simulation_profile", {}))
+    simprof["pick_type_weights"] = blend_weights(
+        simprof.get("pick_type_weights", {"Freshman": 1, "Ready to Contribute": 1, "Upside": 1}), types, learning_rate
+    )
+    simprof["position_weights"] = blend_weights(
+        simprof.get("position_weights", {"QB": 1, "RB": 1, "WR": 1, "TE": 1}), positions, learning_rate
+    )
+    return dict(
+        profile,
+        picktype_by_year=dict(profile.get("picktype_by_year", {}), **{str(year): dict(types)}),
+        position_by_year=dict(profile.get("position_by_year", {}), **{str(year): dict(positions)}),
+        simulation_profile=simprof,
+    )
+
+# --- TRAJECTORIES ---
+def season_data(data, frame, manager_profiles, label):
+    """data for another season's pool and profiles; the draft order, plan and rules table are reused"""
+    pool = compact_pool(frame)
+    compiled = compile_profiles(manager_profiles, data.plan.managers)
+    score_rows, scores, consensus_scores = build_score_matrices(pool, compiled, data.params)
+    if score_rows != data.score_rows:
+        raise ValueError("Season profiles must cover the same managers as the draft plan")
+    return data._replace(
+        pool=pool, manager_profiles=manager_profiles, compiled_profiles=compiled,
+        player_index={p: i for i, p in enumerate(pool["NormPlayer"])},
+        scores=scores, consensus_scores=consensus_scores,
+        rules=compile_rules(data.rules.table, pool), version=f"{data.version}/{label}",
+    )
+
+def carried_roster(ledger, rosters, year, roster_seasons, max_years):
+    """[manager, position] counts of the players drafted in the last roster_seasons seasons
+    that are still eligible"""
+    carried = np.zeros_like(ledger.positions)
+    for manager, players in rosters.items():
+        m = ledger.managers[manager]
+        for season, position, years in players:
+            age = year - season
+            if 0 < age <= roster_seasons and years + age < max_years:
+                carried[m, LEDGER_POSITIONS[position]] += 1
+    return carried
+
+def simulate_trajectory(data, seed, seasons, classes=None, max_years=4, roster_seasons=1, learning_rate=0.3):
+    """Draft seasons consecutive seasons from data; returns one dict per pick with its
+    Trajectory (the seed), Season and the pick's draft_results columns"""
+    np.random.seed(seed)
+    classes = classes or {}
+    season, frame = data, pool_frame(data.pool)
+    years = np.where(frame["PickType"] == "Freshman", 0, 1)
+    template = frame[frame["PickType"] == "Freshman"].reset_index(drop=True)
+    profiles = dict(data.manager_profiles)
+    rosters = {m: [] for m in data.plan.managers}
+    rostered = set()
+    rows = []
+    for k in range(seasons):
+        year = FIRST_SEASON + k
+        if k > 0:
+            frame, years = next_pool(frame, years, drafted, rostered, year, template, classes, max_years)
+            season = season_data(data, frame, profiles, f"dynasty/{seed}/{year}")
+        state = new_draft_state(season)
+        state.ledger.carried = carried_roster(state.ledger, rosters, year, roster_seasons, max_years)
+        while state.current_pick_idx < len(season.plan.manager_ids):
+            simulate_next_pick(season, state, state.current_pick_idx, explain=False)
+            state.current_pick_idx += 1
+            state.pick_number += 1
+        drafted = ~state.available
+        rostered.update(season.pool["NormPlayer"][drafted])
+        picks = {m: [] for m in rosters}
+        for m, ids in zip(state.ledger.managers, state.ledger.players):
+            for pos in ids:
+                player = season.pool.iloc[pos]
+                picks[m].append((player["PickType"], player["Position"]))
+                rosters[m].append((year, player["Position"], int(years[pos])))
+        rows.extend(dict({c: r[c] for c in RESULT_COLUMNS}, Trajectory=seed, Season=year)
+                    for r in state.draft_results if r["Position"])
+        profiles.update({m: update_profile(profiles.get(m, {}), picks[m], year, learning_rate) for m in picks})
+    return rows
+
+def summarize(picks):
+    """Mean picks per trajectory by season, manager and pick type / position"""
+    n = picks["Trajectory"].nunique()
+    by = ["Season", "Manager"]
+    types = picks.groupby(by + ["PickType"]).size().unstack(fill_value=0) / n
+    positions = picks.groupby(by + ["Position"]).size().unstack(fill_value=0) / n
+    return types.join(positions).round(2)
+
+# --- WORKERS: every process attaches to the first season the parent published ---
+_worker_data = None
+_worker_classes = None
+
+def _init_worker(handle, classes):
+    global _worker_data, _worker_classes
+    _worker_data = attach_data(handle)
+    _worker_classes = classes
+
+def _simulate_chunk(seeds, seasons, options):
+    return [row for seed in seeds for row in simulate_trajectory(_worker_data, seed, seasons, _worker_classes, **options)]
+
+def run_dynasty(n_trajectories, seasons, base_dir=".", workers=None, chunk_size=10, seed=0, progress=None, **options):
+    """Simulate n_trajectories multi-season trajectories on a process pool; returns every pick
+    as a DataFrame. options go to simulate_trajectory (max_years, roster_seasons, learning_rate)."""
+    data = load_data(base_dir)
+    classes = load_future_classes(base_dir, seasons)
+    seeds = list(range(seed, seed + n_trajectories))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    rows = []
+    with SharedDraftData(data) as shared, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared.handle, classes)) as pool:
+        futures = [pool.submit(_simulate_chunk, chunk, seasons, options) for chunk in chunks]
+        for done, future in enumerate(futures, 1):
+            rows.extend(future.result())
+            if progress is not None:
+                progress(min(done * chunk_size, n_trajectories), n_trajectories)
+    return pd.DataFrame(rows, columns=["Trajectory", "Season"] + RESULT_COLUMNS)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate consecutive dynasty seasons with carried-over rosters.")
+    parser.add_argument("--trajectories", type=int, default=100)
+    parser.add_argument("--seasons", type=int, default=3)
+    parser.add_argument("--max-years", type=int, default=4, help="seasons a player stays eligible")
+    parser.add_argument("--roster-seasons", type=int, default=1, help="past seasons of picks that count as held players")
+    parser.add_argument("--learning-rate", type=float, default=0.3, help="pull of each season's picks on the profile weights")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--out", default=None, help="write every pick as CSV")
+    args = parser.parse_args()
+
+    picks = run_dynasty(
+        args.trajectories, args.seasons, args.base_dir, args.workers, seed=args.seed,
+        progress=lambda done, total: print(f"\r{done}/{total} trajectories", end="", flush=True),
+        max_years=args.max_years, roster_seasons=args.roster_seasons, learning_rate=args.learning_rate,
+    )
+    print()
+    with pd.option_context("display.max_rows", None, "display.width", 200):
+        print(summarize(picks))
+    if args.out:
+        picks.to_csv(args.out, sep=";", index=False)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# --- LEAGUE REGISTRY: SEVERAL LEAGUES OVER ONE SHARED PLAYER POOL ---
+#
+# leagues.json (optional) lists the leagues of a deployment by id; each names its own
+# draft order, manager profiles and (optionally) pick rules, relative to base_dir:
+#   {"north": {"name": "North", "draft_order": "north/DRAFT ORDER.csv",
+#              "profiles": "north/profiles.json"}, ...}
+# Without the file there is one league, "default", on the standard input files.
+# The merged pool, its index and numeric features are built once; a league only adds
+# its score rows (managers x pool), plan and compiled rules.
+
+import json
+import os
+import threading
+from draft_engine import (
+    DEFAULT_LEAGUE, DEFAULT_PARAMS, LeagueConfig, input_paths, league_data, load_player_pool,
+    refresh_league, refresh_player_pool
+)
+
+LEAGUES_FILE = "leagues.json"
+
+def read_leagues(base_dir="."):
+    """{league id: LeagueConfig} in file order"""
+    path = os.path.join(base_dir, LEAGUES_FILE)
+    if not os.path.exists(path):
+        return {DEFAULT_LEAGUE.league_id: DEFAULT_LEAGUE}
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+    if not table:
+        raise ValueError(f"{LEAGUES_FILE} lists no leagues")
+    return {
+        str(league_id): LeagueConfig(
+            str(league_id), cfg.get("name", str(league_id)), cfg.get("draft_order", DEFAULT_LEAGUE.draft_order),
+            cfg.get("profiles", DEFAULT_LEAGUE.profiles), cfg.get("rules", DEFAULT_LEAGUE.rules),
+        )
+        for league_id, cfg in table.items()
+    }
+
+class LeagueRegistry:
+    """DraftData per league, built on first use over one PlayerPool; safe to share between threads"""
+
+    def __init__(self, base_dir=".", params=DEFAULT_PARAMS):
+        self.base_dir = base_dir
+        self.params = params
+        self.configs = read_leagues(base_dir)
+        self.players = load_player_pool(base_dir)
+        self._leagues = {}
+        self._lock = threading.RLock()
+
+    def league_ids(self):
+        return list(self.configs)
+
+    def get(self, league_id=None):
+        """DraftData for league_id (the first league when None)"""
+        with self._lock:
+            league_id = league_id or next(iter(self.configs))
+            if league_id not in self.configs:
+                raise KeyError(f"Unknown league: {league_id}")
+            if league_id not in self._leagues:
+                self._leagues[league_id] = league_data(self.players, self.configs[league_id], self.base_dir, self.params)
+            return self._leagues[league_id]
+
+    def input_paths(self):
+        """Every file the registry depends on (leagues.json included, even when missing)"""
+        paths = {LEAGUES_FILE: os.path.join(self.base_dir, LEAGUES_FILE)}
+        for league in self.configs.values():
+            paths.update(input_paths(self.base_dir, league))
+        return paths
+
+    def refresh(self):
+        """Apply changed input files: the shared pool is refreshed once and every built league
+        is moved onto it. Returns {league id: changes} for the leagues that changed."""
+        with self._lock:
+            configs = read_leagues(self.base_dir)
+            self.players, updated, added = refresh_player_pool(self.players, self.base_dir)
+            results = {}
+            for league_id, data in list(self._leagues.items()):
+                if league_id not in configs:
+                    del self._leagues[league_id]
+                elif configs[league_id] != self.configs.get(league_id):
+                    self._leagues[league_id] = league_data(self.players, configs[league_id], self.base_dir, self.params)
+                    results[league_id] = {"files": [LEAGUES_FILE], "updated": [], "added": [], "rebuilt": True}
+                else:
+                    data, changes = refresh_league(data, self.players, updated, added, self.base_dir)
+                    if changes:
+                        self._leagues[league_id] = data
+                        results[league_id] = changes
+            self.configs = configs
+            return results
@@ -0,0 +1,71 @@
+# --- LIVE DATA: LEAGUE DATA THAT FOLLOWS ITS INPUT FILES ---
+#
+# A long-running process (the Streamlit server) keeps one LiveData. poll() is cheap: it
+# only stats the input files, at most once per interval, and hashes them when an mtime
+# or size moved. Changed ranking files are merged into the shared pool once and every
+# league is moved onto it, so sessions keep their drafted state; a league whose own
+# files changed is rebuilt over the same pool. DraftData objects are never mutated, so
+# jobs still running on the previous one finish on it.
+
+import logging
+import os
+import threading
+import time
+from draft_engine import DEFAULT_PARAMS
+from leagues import LeagueRegistry
+
+log = logging.getLogger(__name__)
+
+class LiveData:
+    """Current DraftData per league plus the summary of each league's last change (.changes)"""
+
+    def __init__(self, base_dir=".", params=DEFAULT_PARAMS, interval=2.0):
+        self.registry = LeagueRegistry(base_dir, params)
+        self.interval = interval
+        self.changes = {}
+        self._stamps = self._stat()
+        self._checked = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def data(self):
+        """The first league's data"""
+        return self.registry.get()
+
+    def league(self, league_id=None):
+        return self.registry.get(league_id)
+
+    def _stat(self):
+        stamps = {}
+        for name, path in self.registry.input_paths().items():
+            try:
+                stat = os.stat(path)
+                stamps[name] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamps[name] = None
+        return stamps
+
+    def poll(self, force=False):
+        """Apply input changes made since the last poll; returns {league id: changes}"""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._checked < self.interval:
+                return {}
+            self._checked = now
+            stamps = self._stat()
+            if stamps == self._stamps:
+                return {}
+            try:
+                results = self.registry.refresh()
+            except Exception:
+                # Most likely a file caught mid-save: keep the current data, retry next poll
+                log.warning("Could not reload the input files; keeping the current data", exc_info=True)
+                return {}
+            self._stamps = stamps
+            for league_id, changes in results.items():
+                log.info(
+                    "League %s reloaded %s: %s players updated, %s added%s", league_id, ", ".join(changes["files"]),
+                    len(changes["updated"]), len(changes["added"]), " (rebuilt)" if changes["rebuilt"] else ""
+                )
+            self.changes.update(results)
+            return results
@@ -0,0 +1,232 @@
+# --- PICK PROBABILITIES: CLOSED-FORM DISTRIBUTION OF THE NEXT K PICKS ---
+
+import numpy as np
+from draft_engine import fork_draft_state, pick_plan, rank_candidates, record_pick
+
+TOP_N = 4
+
+def _inverse_window_sizes(k):
+    """INV[j, b] = 1 / size of the top-k window when j players above and b below are available"""
+    j = np.arange(k)[:, None]
+    b = np.arange(k)[None, :]
+    return 1.0 / (j + 1 + np.minimum(k - 1 - j, b))
+
+def _add_bernoulli(dist, p, cap):
+    """Count distribution after one more independent Bernoulli(p); the last bucket means >= cap"""
+    out = dist * (1 - p)
+    out[1:] += dist[:-1] * p
+    out[cap] += dist[cap] * p
+    return out
+
+def top_k_pick_probs(ap, k=TOP_N, tol=1e-12):
+    """P(each candidate is drawn) for a uniform draw among the first k available candidates.
+
+    ap holds the availability probabilities of the candidates in score order (best first),
+    assumed independent. Ranks that are almost surely shadowed by k available players
+    above them are truncated, so the cost is bounded by the window, not the pool size.
+    """
+    n = len(ap)
+    out = np.zeros(n)
+    if n == 0:
+        return out
+    above = []
+    dist = np.zeros(k + 1)
+    dist[0] = 1.0
+    cut = n
+    for r in range(n):
+        if dist[:k].sum() < tol:
+            cut = r
+            break
+        above.append(dist)
+        dist = _add_bernoulli(dist, ap[r], k)
+    below = np.zeros(k)
+    below[0] = 1.0
+    for r in range(cut, n):
+        if below[k - 1] > 1 - tol:
+            break
+        below = _add_bernoulli(below, ap[r], k - 1)
+    inv = _inverse_window_sizes(k)
+    for r in range(cut - 1, -1, -1):
+        out[r] = ap[r] * (above[r][:k] @ inv @ below)
+        below = _add_bernoulli(below, ap[r], k - 1)
+    return out
+
+def stage_probabilities(plan, avail_prob, tol=1e-12):
+    """Distribution over pool rows of the pick described by a pick_plan().
+
+    Stages are tried in order; a stage is reached only when every earlier one is empty,
+    which also means its players are known to be gone when later stages are evaluated.
+    """
+    probs = np.zeros(len(avail_prob))
+    reach = 1.0
+    seen = np.zeros(len(avail_prob), dtype=bool)
+    for branch, candidates, outlier in plan["stages"]:
+        if not len(candidates):
+            continue
+        score = plan.get("stage_scores", {}).get(branch, plan.get("score"))
+        order = rank_candidates(candidates, score)
+        ap = avail_prob[order] * ~seen[order]
+        probs[order] += reach * top_k_pick_probs(ap, plan.get("top_n", TOP_N))
+        reach *= float(np.prod(1 - ap))
+        seen[order] = True
+        if reach < tol:
+            break
+    return probs
+
+def _state_key(state):
+    """Two draft states with the same key make identical future picks"""
+    return state.available.tobytes() + state.ledger.key()
+
+def _expand_exact(data, beam, idx, row):
+    """One exact pick for every weighted state of the beam; equal children are merged"""
+    children = {}
+    for weight, state in beam:
+        plan = pick_plan(data, state, idx)
+        if not plan["stages"]:
+            outcomes = [(1.0, None)]
+        else:
+            dist = stage_probabilities(plan, state.available.astype(float))
+            row += weight * dist
+            outcomes = [(dist[i], i) for i in np.flatnonzero(dist)]
+        for p, i in outcomes:
+            child = fork_draft_state(state, log=False)
+            if i is not None:
+                record_pick(data, child, plan["manager"], plan["round_num"], plan["overall_pick"], data.pool.iloc[i], "")
+            child.current_pick_idx = idx + 1
+            key = _state_key(child)
+            if key in children:
+                children[key][0] += weight * p
+            else:
+                children[key] = [weight * p, child]
+    return [(w, child) for w, child in children.values()]
+
+def _window_probs(removal, n_cands, k=TOP_N):
+    """P(candidate r is drawn) when earlier picks are independent categorical draws.
+
+    removal[p, r] is the probability that earlier pick p took candidate r (candidates in
+    score order, truncated to the first k + picks ranks, beyond which nobody can reach the
+    window). Unlike per-player independence, each earlier pick removes at most one
+    candidate, so "exactly one of these four went" is represented exactly. The candidate's
+    own survival is taken as independent of how the window around it was thinned.
+    """
+    m, l = removal.shape
+    above = np.cumsum(removal, axis=1) - removal
+    below = removal.sum(axis=1, keepdims=True) - above - removal
+    # A player can only be taken once, so the candidate's own survival is 1 - sum(removal)
+    # exactly; the earlier picks that did not take it are spread over above/below/elsewhere.
+    survival = np.clip(1.0 - removal.sum(axis=0), 0.0, 1.0)
+    other = np.clip(1.0 - above - below, 0.0, 1.0)
+    dist = np.zeros((l, m + 1, m + 1))
+    dist[:, 0, 0] = 1.0
+    for p in range(m):
+        new = dist * other[p][:, None, None]
+        new[:, 1:, :] += dist[:, :-1, :] * above[p][:, None, None]
+        new[:, :, 1:] += dist[:, :, :-1] * below[p][:, None, None]
+        dist = new
+    ranks = np.arange(l)[:, None, None]
+    t = np.arange(m + 1)[None, :, None]
+    u = np.arange(m + 1)[None, None, :]
+    avail_above = ranks - t
+    if n_cands > l:
+        size = np.full(avail_above.shape, k)
+    else:
+        size = np.minimum(k, avail_above + 1 + (l - 1 - ranks - u))
+    ok = (avail_above >= 0) & (avail_above < k) & (size > 0)
+    weight = np.where(ok, 1.0 / np.maximum(size, 1), 0.0)
+    return survival * (dist * weight).sum(axis=(1, 2))
+
+def _all_removed(removal, exact_limit=8):
+    """P(every candidate was taken by some earlier pick)"""
+    m, c = removal.shape
+    if c > m:
+        return 0.0
+    if c > exact_limit:
+        return float(np.prod(np.clip(removal.sum(axis=0), 0.0, 1.0)))
+    dist = np.zeros(1 << c)
+    dist[0] = 1.0
+    for p in range(m):
+        new = dist * (1.0 - removal[p].sum())
+        for j in range(c):
+            bit = 1 << j
+            masks = np.arange(1 << c)
+            np.add.at(new, masks | bit, dist * removal[p, j])
+        dist = new
+    return float(dist[-1])
+
+def stage_probabilities_given(plan, base_available, earlier_rows, tol=1e-12):
+    """Distribution of the planned pick when earlier_rows (one per prior pick in the horizon)
+    may already have removed some of the base_available players"""
+    n = len(base_available)
+    probs = np.zeros(n)
+    m = len(earlier_rows)
+    rows = np.array(earlier_rows).reshape(m, n)
+    reach = 1.0
+    seen = np.zeros(n, dtype=bool)
+    for branch, candidates, outlier in plan["stages"]:
+        score = plan.get("stage_scores", {}).get(branch, plan.get("score"))
+        order = rank_candidates(candidates, score)
+        order = order[base_available[order] & ~seen[order]]
+        if len(order) == 0:
+            continue
+        k = plan.get("top_n", TOP_N)
+        window = order[:k + m]
+        probs[window] += reach * _window_probs(rows[:, window], len(order), k)
+        reach *= _all_removed(rows[:, order])
+        seen[order] = True
+        if reach < tol:
+            break
+    return probs
+
+def _propagate(data, state, weight, pick_indices, matrix, tol=1e-9):
+    """Analytic pass from one exact state: earlier picks of the horizon are treated as
+    independent categorical draws over the players they could take"""
+    base_available = state.available.copy()
+    sim = fork_draft_state(state, log=False)
+    earlier_rows = []
+    taken = np.zeros(len(base_available))
+    for j, idx in pick_indices:
+        sim.available = base_available & (taken < 1 - tol)
+        sim.current_pick_idx = idx
+        plan = pick_plan(data, sim, idx)
+        if not plan["stages"]:
+            continue
+        row = stage_probabilities_given(plan, base_available, earlier_rows)
+        matrix[j] += weight * row
+        earlier_rows.append(row)
+        taken += row
+        modal = int(np.argmax(row))
+        if row[modal] > 0:
+            record_pick(data, sim, plan["manager"], plan["round_num"], plan["overall_pick"], data.pool.iloc[modal], "")
+
+def pick_probability_matrix(data, state, n_picks, max_states=16):
+    """Pick probabilities for the next n_picks draft slots.
+
+    Returns (pick_indices, matrix) where matrix[j, i] is P(pool row i is taken at draft
+    order index pick_indices[j]). Picks are enumerated exactly (equal states merged) while
+    the number of distinct weighted states stays within max_states, which also makes the
+    first row always exact. From there each state is continued analytically: every later
+    pick sees the earlier ones as independent categorical draws (each removes one player),
+    and a manager who picks again inside the horizon is advanced with its modal pick.
+    Empty-manager slots get an all-zero row.
+    """
+    start = state.current_pick_idx
+    pick_indices = list(range(start, min(start + n_picks, len(data.draft_order))))
+    matrix = np.zeros((len(pick_indices), len(state.available)))
+    beam = [(1.0, fork_draft_state(state, log=False))]
+    j = 0
+    while j < len(pick_indices):
+        if j > 0 and len(beam) * data.params.top_n > max_states:
+            break
+        beam = _expand_exact(data, beam, pick_indices[j], matrix[j])
+        j += 1
+    rest = list(enumerate(pick_indices))[j:]
+    if rest:
+        for weight, leaf in beam:
+            _propagate(data, leaf, weight, rest, matrix)
+    return pick_indices, matrix
+
+def availability_at(data, state, target_idx, max_states=16):
+    """P(each pool row is still available when draft order index target_idx is on the clock)"""
+    n_picks = max(target_idx - state.current_pick_idx, 0)
+    pick_indices, matrix = pick_probability_matrix(data, state, n_picks, max_states=max_states)
+    return np.clip(state.available.astype(float) - matrix.sum(axis=0), 0.0, 1.0)
@@ -0,0 +1,226 @@
+# --- PLAYER MATCHING: ONE CANONICAL ID PER PLAYER ACROSS RANKING SOURCES ---
+#
+# Every source (ADP list, 247 freshman rank, ...) is a list of records with a normalized
+# name, college and position. Records are matched to canonical players through a blocking
+# index of name trigrams keyed by position and by college, so each record is scored only
+# against the few players sharing enough of its trigrams instead of the whole table.
+# Sources are matched in order; the first one to mention a player creates its id.
+# Usage: python player_matching.py [--min-confidence 0.9] [--review 0.99]
+
+import argparse
+import difflib
+import hashlib
+import logging
+import os
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+ID_COLUMNS = ["CanonicalId", "Source", "NormPlayer", "NormCollege", "Position", "Confidence", "SourceHash"]
+
+def name_grams(norm_player, n=3):
+    """Character n-grams of a normalized name with the spaces removed ("C J" and "CJ" agree)"""
+    s = f"#{norm_player.replace(' ', '')}#"
+    return {s[i:i + n] for i in range(max(len(s) - n + 1, 1))}
+
+def name_similarity(a, b):
+    if a == b:
+        return 1.0
+    return max(
+        difflib.SequenceMatcher(None, a, b).ratio(),
+        difflib.SequenceMatcher(None, a.replace(" ", ""), b.replace(" ", "")).ratio(),
+    )
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class PlayerMatcher:
+    """Canonical player ids across sources, updated one source at a time.
+
+    update_source() only re-matches the source that changed: its previous links are
+    removed from the index and its records are matched against everything else.
+    A canonical player takes at most one record per source.
+    """
+
+    def __init__(self, min_confidence=0.9, min_shared=0.5):
+        self.min_confidence = min_confidence
+        self.min_shared = min_shared
+        self.sources = {}   # source -> {"hash": str, "links": [row dicts]}
+        self.members = {}   # canonical id -> {source: record}
+        self.index = {}     # ("NAME", name) or (block, gram) -> {canonical id: member records with it}
+        self.next_id = 0
+
+    # --- INDEX ---
+    def _blocks(self, record):
+        blocks = []
+        if record["Position"]:
+            blocks.append(("POS", record["Position"]))
+        if record["NormCollege"]:
+            blocks.append(("COL", record["NormCollege"]))
+        return blocks
+
+    def _index(self, cid, record, add=True):
+        keys = [("NAME", record["NormPlayer"])]
+        keys += [(block, gram) for block in self._blocks(record) for gram in name_grams(record["NormPlayer"])]
+        for key in keys:
+            ids = self.index.setdefault(key, {})
+            ids[cid] = ids.get(cid, 0) + (1 if add else -1)
+            if ids[cid] <= 0:
+                del ids[cid]
+                if not ids:
+                    del self.index[key]
+
+    def candidates(self, record):
+        """Canonical ids with the same name, or sharing at least min_shared of the record's
+        name trigrams in one of its blocks"""
+        grams = name_grams(record["NormPlayer"])
+        found = set(self.index.get(("NAME", record["NormPlayer"]), ()))
+        for block in self._blocks(record):
+            hits = {}
+            for gram in grams:
+                for cid in self.index.get((block, gram), ()):
+                    hits[cid] = hits.get(cid, 0) + 1
+            found.update(cid for cid, n in hits.items() if n >= self.min_shared * len(grams))
+        return found
+
+    def confidence(self, record, other):
+        """Exact normalized names always match (the old join rule); otherwise name similarity
+        weighted with college and position agreement"""
+        if record["NormPlayer"] == other["NormPlayer"]:
+            return 1.0
+        def agree(a, b):
+            return 0.5 if not a or not b else float(a == b)
+        return (0.7 * name_similarity(record["NormPlayer"], other["NormPlayer"])
+                + 0.2 * agree(record["NormCollege"], other["NormCollege"])
+                + 0.1 * agree(record["Position"], other["Position"]))
+
+    def match(self, source, record):
+        """(canonical id, confidence) of the best player without a record from source yet,
+        or (None, 0.0) when nothing reaches min_confidence"""
+        best, best_conf = None, 0.0
+        for cid in self.candidates(record):
+            members = self.members[cid]
+            if source in members:
+                continue
+            conf = max(self.confidence(record, m) for m in members.values())
+            if conf > best_conf or (conf == best_conf and best is not None and cid < best):
+                best, best_conf = cid, conf
+        return (best, best_conf) if best_conf >= self.min_confidence else (None, 0.0)
+
+    # --- SOURCES ---
+    def remove_source(self, source):
+        for link in self.sources.pop(source, {"links": []})["links"]:
+            cid = link["CanonicalId"]
+            record = self.members[cid].pop(source)
+            self._index(cid, record, add=False)
+            if not self.members[cid]:
+                del self.members[cid]
+
+    def _link(self, source, cid, record, confidence):
+        self.members.setdefault(cid, {})[source] = record
+        self._index(cid, record)
+        return dict(record, CanonicalId=cid, Source=source, Confidence=round(confidence, 4))
+
+    def update_source(self, source, records, source_hash=None):
+        """Match a source's records (dicts with NormPlayer, NormCollege, Position).
+
+        A source whose hash is unchanged is left alone. A player that matches nothing gets
+        back the id it had in this source before, if that id is free. Returns True when the
+        table changed.
+        """
+        if source_hash is not None and self.sources.get(source, {}).get("hash") == source_hash:
+            return False
+        previous = self.canonical_ids(source)
+        self.remove_source(source)
+        links = []
+        seen = set()
+        for record in records:
+            record = {k: str(record.get(k) or "") for k in ["NormPlayer", "NormCollege", "Position"]}
+            if not record["NormPlayer"] or record["NormPlayer"] in seen:
+                continue
+            seen.add(record["NormPlayer"])
+            cid, conf = self.match(source, record)
+            if cid is None:
+                cid, conf = previous.get(record["NormPlayer"]), 1.0
+                if cid is None or cid in self.members:
+                    cid = self.next_id
+                    self.next_id += 1
+            links.append(self._link(source, cid, record, conf))
+        self.sources[source] = {"hash": source_hash, "links": links}
+        log.info("Matched %s: %s records, %s new players", source, len(links), sum(l["CanonicalId"] not in previous.values() for l in links))
+        return True
+
+    def canonical_ids(self, source):
+        """{NormPlayer: canonical id} for one source"""
+        return {link["NormPlayer"]: link["CanonicalId"] for link in self.sources.get(source, {}).get("links", [])}
+
+    # --- ID TABLE ---
+    def table(self):
+        rows = [dict(link, SourceHash=s["hash"]) for s in self.sources.values() for link in s["links"]]
+        return pd.DataFrame(rows, columns=ID_COLUMNS).sort_values(["CanonicalId", "Source"]).reset_index(drop=True)
+
+    def save(self, path):
+        # Written aside and renamed, so a process loading the table never sees half a file
+        tmp = f"{path}.{os.getpid()}.tmp"
+        self.table().to_csv(tmp, sep=";", index=False)
+        os.replace(tmp, path)
+
+    @classmethod
+    def from_table(cls, table, **kwargs):
+        """Rebuild a matcher (index included) from a saved id table"""
+        matcher = cls(**kwargs)
+        table = table.fillna("")
+        for source, rows in table.groupby("Source", sort=False):
+            links = []
+            for row in rows.to_dict("records"):
+                record = {k: str(row[k]) for k in ["NormPlayer", "NormCollege", "Position"]}
+                links.append(matcher._link(source, int(row["CanonicalId"]), record, float(row["Confidence"])))
+            matcher.sources[source] = {"hash": rows["SourceHash"].iloc[0] or None, "links": links}
+        matcher.next_id = int(table["CanonicalId"].max()) + 1 if len(table) else 0
+        return matcher
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        if not os.path.exists(path):
+            return cls(**kwargs)
+        return cls.from_table(pd.read_csv(path, sep=";", dtype={"SourceHash": str, "Position": str}), **kwargs)
+
+def match_sources(sources, table_path=None, **kwargs):
+    """sources: [(name, DataFrame with NormPlayer/NormCollege/Position, source hash)], in
+    priority order. Reuses and updates the id table at table_path when given (a read-only
+    location just skips the save). Returns the matcher."""
+    matcher = PlayerMatcher.load(table_path, **kwargs) if table_path else PlayerMatcher(**kwargs)
+    changed = False
+    for name, frame, source_hash in sources:
+        changed |= matcher.update_source(name, frame.to_dict("records"), source_hash)
+    if table_path and changed:
+        try:
+            matcher.save(table_path)
+        except OSError:
+            pass
+    return matcher
+
+def main():
+    from draft_engine import PLAYER_IDS_FILE, load_player_sources
+    parser = argparse.ArgumentParser(description="Build the canonical player id table and list the fuzzy matches.")
+    parser.add_argument("--base-dir", default=".")
+    parser.add_argument("--min-confidence", type=float, default=0.9)
+    parser.add_argument("--review", type=float, default=1.0, help="list matches with confidence below this")
+    args = parser.parse_args()
+
+    sources = load_player_sources(args.base_dir)
+    matcher = match_sources(sources, os.path.join(args.base_dir, PLAYER_IDS_FILE), min_confidence=args.min_confidence)
+    table = matcher.table()
+    shared = table[table.groupby("CanonicalId")["Source"].transform("size") > 1]
+    print(f"{table['CanonicalId'].nunique()} players from {len(table)} records, {shared['CanonicalId'].nunique()} in several sources")
+    review = shared[shared.groupby("CanonicalId")["Confidence"].transform("min") < args.review]
+    if len(review):
+        with pd.option_context("display.max_rows", None, "display.width", 200):
+            print(review.drop(columns="SourceHash").to_string(index=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# --- PICK RECOMMENDER: ANYTIME LOOKAHEAD OVER THE OPPONENT MODEL ---
+
+import time
+import math
+import numpy as np
+from draft_engine import (
+    available_players, can_draft_mask, score_players, fork_draft_state, record_player,
+    simulate_next_pick, slot_info, next_slot_of
+)
+
+def next_pick_idx(data, team, after_idx):
+    """Index of team's next slot strictly after after_idx, or None"""
+    return next_slot_of(data.plan, team, after_idx + 1)
+
+def player_value(avail, profile):
+    """Roster value used to compare outcomes: the team's own draft_pick score, except that a
+    missing ADP (freshmen) is neutral instead of the 1000-slot penalty draft_pick uses to
+    separate pick types"""
+    return score_players(avail, profile, adp_fill=0)
+
+def rollout(data, state, team, candidate, until_idx, values, rng=None):
+    """Draft pool row candidate for team, let every other slot pick by the model up to
+    team's next turn and sample team's pick there the same way; returns the value of both
+    picks (the second is 0 when nothing is left for team). values is player_value over the
+    whole pool, so a rollout only simulates picks and indexes it."""
+    sim = fork_draft_state(state, log=False)
+    record_player(data, sim, team, candidate)
+    sim.current_pick_idx += 1
+    sim.pick_number += 1
+    value = float(values[candidate])
+    if until_idx is None:
+        return value
+    while sim.current_pick_idx < until_idx:
+        simulate_next_pick(data, sim, sim.current_pick_idx, explain=False, rng=rng)
+        sim.current_pick_idx += 1
+        sim.pick_number += 1
+    _, pos, _ = simulate_next_pick(data, sim, until_idx, explain=False, rng=rng)
+    if pos < 0:
+        return value
+    return value + float(values[pos])
+
+def recommend(data, state, team, time_budget=2.0, n_candidates=5, min_samples=3, should_stop=None, rng=None):
+    """Rank the best-scored candidates for team by simulated value through its next pick.
+
+    Anytime search: every candidate gets one rollout per sweep until the deadline, and a
+    candidate stops being sampled once it is clearly beaten (upper bound below the
+    leader's lower bound after min_samples). should_stop() ends the search early like the
+    deadline does. Rollouts draw from rng (a fresh RandomState when None, never the global
+    RNG). Returns dicts sorted by mean value. Raises ValueError when the draft is over or
+    team is not the one on the clock.
+    """
+    deadline = time.perf_counter() + time_budget
+    def out_of_time():
+        return time.perf_counter() >= deadline or (should_stop is not None and should_stop())
+    idx = state.current_pick_idx
+    if idx >= len(data.plan.manager_ids):
+        raise ValueError("The draft is already complete.")
+    manager, round_num, _ = slot_info(data.plan, idx)
+    if manager != team:
+        raise ValueError(f"{team} is not on the clock ({manager or 'skipped pick'} is).")
+    profile = data.compiled_profiles[team][7]
+    avail = available_players(data, state)
+    avail = avail[can_draft_mask(avail, team, round_num, state.ledger)]
+    if avail.empty:
+        return []
+    pool_values = player_value(data.pool, profile)
+    values = pool_values.to_numpy()
+    top = pool_values[avail.index].sort_values(ascending=False).head(n_candidates)
+    rng = np.random.RandomState() if rng is None else rng
+    until_idx = next_pick_idx(data, team, idx)
+    candidates = [int(pos) for pos in data.pool.index.get_indexer(top.index)]
+    stats = {pos: [0, 0.0, 0.0] for pos in candidates}
+    active = list(candidates)
+    while active:
+        for pos in active:
+            value = rollout(data, state, team, pos, until_idx, values, rng)
+            s = stats[pos]
+            s[0] += 1
+            s[1] += value
+            s[2] += value * value
+            if out_of_time():
+                break
+        if out_of_time() or until_idx is None:
+            break
+        summary = {pos: _mean_stderr(*stats[pos]) for pos in active}
+        if all(stats[pos][0] >= min_samples for pos in active):
+            best_low = max(m - 2 * se for m, se in summary.values())
+            active = [pos for pos in active if summary[pos][0] + 2 * summary[pos][1] >= best_low]
+            if len(active) == 1:
+                break
+    results = []
+    for pos, (n, total, total_sq) in stats.items():
+        if n == 0:
+            continue
+        mean, stderr = _mean_stderr(n, total, total_sq)
+        row = data.pool.iloc[pos]
+        results.append({
+            "Player": row["Player"], "NormPlayer": row["NormPlayer"], "Position": row["Position"],
+            "PickType": row["PickType"], "Value": round(mean, 4), "StdErr": round(stderr, 4), "Samples": n,
+        })
+    return sorted(results, key=lambda r: r["Value"], reverse=True)
+
+def _mean_stderr(n, total, total_sq):
+    mean = total / n
+    if n < 2:
+        return mean, float("inf")
+    var = max(total_sq / n - mean * mean, 0.0) * n / (n - 1)
+    return mean, math.sqrt(var / n)
@@ -0,0 +1,117 @@
+# --- SHARED DATA: STATIC ARRAYS PUBLISHED ONCE FOR WORKER PROCESSES ---
+#
+# The parent loads DraftData once and copies its numeric arrays (score matrices, pool
+# feature columns, category codes, compiled rule masks) into one shared-memory block.
+# Workers attach read-only and rebuild DraftData around views of that block, so no
+# worker re-reads the CSVs or keeps its own copy of the matrices, and tasks carry only
+# seeds and compact states. Strings and the small dicts (draft order, profiles) travel
+# once per worker inside the handle.
+
+import pickle
+from multiprocessing import shared_memory
+import numpy as np
+import pandas as pd
+from draft_engine import DraftData, CompiledRules
+
+ALIGN = 64
+
+def _split(data):
+    """(arrays, meta): every numpy array worth sharing, and the picklable rest"""
+    arrays = {"scores": data.scores, "consensus_scores": data.consensus_scores}
+    columns = []
+    for col in data.pool.columns:
+        s = data.pool[col]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            arrays[f"pool.{col}"] = s.cat.codes.to_numpy()
+            columns.append((col, "category", list(s.cat.categories)))
+        elif isinstance(s.dtype, pd.api.extensions.ExtensionDtype) and pd.api.types.is_integer_dtype(s.dtype):
+            arrays[f"pool.{col}"] = s.to_numpy(dtype=s.dtype.numpy_dtype, na_value=0)
+            arrays[f"pool.{col}.mask"] = s.isna().to_numpy()
+            columns.append((col, "nullable", None))
+        elif s.dtype != object:
+            arrays[f"pool.{col}"] = s.to_numpy()
+            columns.append((col, "array", None))
+        else:
+            columns.append((col, "object", s.tolist()))
+    if data.rules is not None:
+        for kind in ["filters", "stages"]:
+            for i, (_, mask) in enumerate(getattr(data.rules, kind)):
+                arrays[f"rules.{kind}.{i}"] = mask
+    meta = {
+        "fields": {f: getattr(data, f) for f in [
+            "draft_order", "manager_profiles", "compiled_profiles", "player_index", "score_rows", "params", "version", "plan", "file_hashes", "league"
+        ]},
+        "pool_columns": columns,
+        "pool_index": data.pool.index,
+        "rules": None if data.rules is None else (
+            data.rules.table, [rule for rule, _ in data.rules.filters], [rule for rule, _ in data.rules.stages]
+        ),
+    }
+    return arrays, meta
+
+def _join(arrays, meta):
+    """DraftData over the (shared) arrays; the pool columns are views, not copies"""
+    columns = {}
+    for col, kind, extra in meta["pool_columns"]:
+        if kind == "category":
+            columns[col] = pd.Categorical.from_codes(arrays[f"pool.{col}"], extra)
+        elif kind == "nullable":
+            columns[col] = pd.arrays.IntegerArray(arrays[f"pool.{col}"], arrays[f"pool.{col}.mask"])
+        elif kind == "array":
+            columns[col] = arrays[f"pool.{col}"]
+        else:
+            columns[col] = extra
+    pool = pd.DataFrame(columns, index=meta["pool_index"], copy=False)
+    rules = None
+    if meta["rules"] is not None:
+        table, filters, stages = meta["rules"]
+        rules = CompiledRules(
+            table,
+            [(rule, arrays[f"rules.filters.{i}"]) for i, rule in enumerate(filters)],
+            [(rule, arrays[f"rules.stages.{i}"]) for i, rule in enumerate(stages)],
+        )
+    return DraftData(
+        pool=pool, scores=arrays["scores"], consensus_scores=arrays["consensus_scores"], rules=rules, **meta["fields"]
+    )
+
+class SharedDraftData:
+    """Owner side: publishes data into shared memory. handle is small and picklable (pass it
+    to worker initializers); close() releases the block once the workers are done."""
+
+    def __init__(self, data):
+        arrays, meta = _split(data)
+        layout, offset = {}, 0
+        for key, arr in arrays.items():
+            offset = -(-offset // ALIGN) * ALIGN
+            layout[key] = (offset, arr.shape, arr.dtype.str)
+            offset += arr.nbytes
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for key, arr in arrays.items():
+            start, shape, dtype = layout[key]
+            np.ndarray(shape, dtype=np.dtype(dtype), buffer=self.shm.buf, offset=start)[...] = arr
+        self.handle = (self.shm.name, layout, pickle.dumps(meta, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Segments attached by this process stay mapped for its lifetime
+_attached = []
+
+def attach_data(handle):
+    """Worker side: DraftData backed by the published block (its arrays are read-only)"""
+    name, layout, meta = handle
+    shm = shared_memory.SharedMemory(name=name)
+    _attached.append(shm)
+    arrays = {}
+    for key, (offset, shape, dtype) in layout.items():
+        arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+        arr.flags.writeable = False
+        arrays[key] = arr
+    return _join(arrays, pickle.loads(meta))
@@ -0,0 +1,166 @@
+# --- SIMULATION CACHE: IN-MEMORY LRU IN FRONT OF A SIZE-CAPPED DISK STORE ---
+#
+# Keys are digests of everything a simulation depends on: the input-data version (the
+# hash of every CSV/JSON file), the scoring parameters, the pick rules, the draft state
+# (availability mask and roster ledger), the pick index, the RNG seed and the question
+# asked. Editing a profile or a CSV changes data.version, so old entries simply stop
+# matching and age out of the disk store.
+
+import hashlib
+import json
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+CACHE_DIR = ".sim_cache"
+
+def state_digest(data, state, seed=None, **question):
+    """Canonical key for a result computed from state under data and seed"""
+    h = hashlib.sha1()
+    h.update(data.version.encode())
+    h.update(repr(tuple(data.params)).encode())
+    h.update(json.dumps(data.rules.table if data.rules is not None else None, sort_keys=True).encode())
+    h.update(state.available.tobytes())
+    h.update(state.ledger.key())
+    h.update(repr((state.current_pick_idx, seed, sorted(question.items()))).encode())
+    return h.hexdigest()
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class SimCache:
+    """Two-tier cache for simulation outputs; safe to share between threads and sessions.
+
+    get() checks the memory LRU (memory_items entries), then the disk store, where a hit
+    is promoted back into memory. The disk store keeps one pickle per key and drops the
+    least recently used files once it holds more than disk_bytes.
+    """
+
+    def __init__(self, directory=CACHE_DIR, memory_items=256, disk_bytes=256 * 1024 * 1024):
+        self.directory = directory
+        self.memory_items = memory_items
+        self.disk_bytes = disk_bytes
+        self.hits = {"memory": 0, "disk": 0, "miss": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()        # memory tier and hit counters
+        self._disk_lock = threading.Lock()   # disk size bookkeeping, renames and eviction
+        self._disk_size = None
+
+    # --- MEMORY TIER ---
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    # --- DISK TIER ---
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.pkl")
+
+    def _disk_files(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".pkl"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)   # the mtime doubles as the last-used time for eviction
+            return True, value
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False, None
+
+    def _write(self, key, value):
+        """Serialize and write the temp file without holding a lock; only the rename and the
+        size bookkeeping (which replaces the old entry's size, if any) are serialized"""
+        path = self._path(key)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(payload)
+        except OSError:
+            _discard(tmp)
+            return
+        with self._disk_lock:
+            if self._disk_size is None:
+                self._disk_size = sum(size for _, size, _ in self._disk_files())
+            try:
+                old = os.path.getsize(path)
+            except OSError:
+                old = 0
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                _discard(tmp)
+                return
+            self._disk_size += len(payload) - old
+            if self._disk_size > self.disk_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used files until the store is back under 80% of disk_bytes"""
+        files = sorted(self._disk_files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= 0.8 * self.disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_size = total
+
+    # --- API ---
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return self._memory[key]
+        # Disk reads happen outside the lock so memory hits never wait on them
+        found, value = self._read(key)
+        with self._lock:
+            if found:
+                self._remember(key, value)
+                self.hits["disk"] += 1
+                return value
+            self.hits["miss"] += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._remember(key, value)
+        self._write(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, or compute() stored under key. Concurrent misses for one
+        key may both compute; the last result wins, which is harmless for equal inputs."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            for path, _, _ in list(self._disk_files()):
+                _discard(path)
+            self._disk_size = 0
@@ -0,0 +1,237 @@
+# --- BACKGROUND JOBS: LONG SIMULATIONS OFF THE STREAMLIT SCRIPT THREAD ---
+
+import logging
+import threading
+import time
+import numpy as np
+from draft_engine import fork_draft_state, next_stop, record_pick, slot_info
+from draft_room import apply_event, sim_pick_event
+from recommender import recommend, next_pick_idx
+from pick_probabilities import availability_at
+from sim_cache import state_digest
+
+log = logging.getLogger(__name__)
+
+class BackgroundJob:
+    """Runs work() on a daemon thread; progress and cancel are safe to use from any thread.
+
+    Subclasses implement work() and call self.step() whenever they finish a unit of
+    work; cancelled() turns true after cancel() and is checked at those boundaries.
+    """
+
+    def __init__(self, label, total):
+        self.label = label
+        self.total = total
+        self.done = 0
+        self.result = None
+        self.error = None
+        self.finished = False
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"job-{label}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.work()
+        except Exception as e:
+            log.exception("%s failed", self.label)
+            self.error = e
+        finally:
+            with self._lock:
+                self.finished = True
+
+    def work(self):
+        raise NotImplementedError
+
+    def step(self, n=1):
+        with self._lock:
+            self.done += n
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return not self.finished
+
+    def fraction(self):
+        return min(self.done / self.total, 1.0) if self.total else 1.0
+
+class PickJob(BackgroundJob):
+    """Simulate CPU picks until a stop team is on the clock, the draft ends or cancel().
+
+    Solo drafts run on a fork of the session state and publish each pick as a room-style
+    event, so only the script thread ever changes the session replica (apply_event).
+    In a room the room is advanced directly and its own log carries the picks. delay
+    spaces picks out for auto-draft without holding the script thread. A solo run with a
+    seed draws from its own RandomState(seed), so the picks depend on the seed alone even
+    while other threads simulate; with a cache they are stored (or replayed) as a whole.
+    """
+
+    def __init__(self, data, state, stop_teams=(), room=None, delay=0.0, label="Simulating picks", cache=None, seed=None):
+        stop_teams = set(stop_teams) | (room.human_teams() if room is not None else set())
+        self.stop_idx = next_stop(data.plan, stop_teams, state.current_pick_idx)
+        super().__init__(label, self.stop_idx - state.current_pick_idx)
+        self.data = data
+        self.room = room
+        self.delay = delay
+        self.stop_teams = stop_teams
+        self.state = fork_draft_state(state) if room is None else None
+        self.events = []
+        self.seed = seed
+        self.cache = cache if room is None and seed is not None else None
+        self.cache_key = state_digest(data, self.state, seed, job="picks", stop=sorted(stop_teams)) if self.cache else None
+
+    def _publish(self, event):
+        with self._lock:
+            self.events.append(event)
+        self.step()
+        return not (self.delay and self._cancel.wait(self.delay))
+
+    def work(self):
+        if self.room is not None:
+            while not self.cancelled():
+                if self.room.current_manager() in self.stop_teams or self.room.sim_next() is None:
+                    break
+                self.step()
+                if self.delay and self._cancel.wait(self.delay):
+                    break
+            return
+        cached = self.cache.get(self.cache_key) if self.cache else None
+        if cached is not None:
+            for event in cached:
+                if self.cancelled() or not self._publish(event):
+                    break
+            return
+        # The job's own RNG: other threads (sessions, speculation) draw at the same time
+        rng = np.random.RandomState(self.seed)
+        while not self.cancelled():
+            if self.state.current_pick_idx >= self.stop_idx:
+                if self.cache:
+                    self.cache.put(self.cache_key, list(self.events))
+                break
+            if not self._publish(sim_pick_event(self.data, self.state, len(self.events) + 1, rng)):
+                break
+
+    def events_since(self, seq):
+        with self._lock:
+            return self.events[seq:]
+
+def recommend_key(data, state, team, time_budget):
+    return state_digest(data, state, None, job="recommend", team=team, time_budget=time_budget)
+
+def next_turn_recommendation(data, state, team, time_budget, should_stop=None):
+    """recommend() plus how likely each candidate is to still be there at team's next turn if it passes now"""
+    results = recommend(data, state, team, time_budget=time_budget, should_stop=should_stop)
+    until_idx = next_pick_idx(data, team, state.current_pick_idx)
+    if until_idx is not None and results and not (should_stop is not None and should_stop()):
+        after_us = fork_draft_state(state, log=False)
+        after_us.current_pick_idx += 1
+        survival = availability_at(data, after_us, until_idx)
+        for r in results:
+            r["Next Turn %"] = round(100 * float(survival[data.player_index[r["NormPlayer"]]]), 1)
+    return results
+
+class RecommendJob(BackgroundJob):
+    """next_turn_recommendation(), with progress measured against the budget"""
+
+    def __init__(self, data, state, team, time_budget, cache=None):
+        super().__init__("Recommending", 100)
+        self.data = data
+        self.state = fork_draft_state(state)
+        self.team = team
+        self.time_budget = time_budget
+        self.pick_idx = state.current_pick_idx
+        self.cache = cache
+        self.cache_key = recommend_key(data, state, team, time_budget) if cache else None
+        self._started = None
+
+    def fraction(self):
+        if self.finished:
+            return 1.0
+        if self._started is None:
+            return 0.0
+        return min((time.perf_counter() - self._started) / self.time_budget, 0.99)
+
+    def work(self):
+        self._started = time.perf_counter()
+        if self.cache:
+            cached = self.cache.get(self.cache_key)
+            if cached is not None:
+                return cached
+        results = next_turn_recommendation(self.data, self.state, self.team, self.time_budget, self.cancelled)
+        if self.cache and not self.cancelled():
+            self.cache.put(self.cache_key, results)
+        return results
+
+class SpeculateJob(BackgroundJob):
+    """Work ahead while team is on the clock in a solo draft.
+
+    For each candidate (NormPlayer names, most likely pick first) the candidate is drafted
+    on a fork, the CPU picks up to team's next turn are simulated with the session seed and
+    stored under the key the PickJob after that pick looks up; then the recommendation at
+    that next turn is stored under RecommendJob's key. Both jobs then answer from the cache.
+    Picks for every candidate come first, as they are cheap. focus() tells the job which
+    player was actually drafted: work for the others stops and is simply never used.
+    """
+
+    def __init__(self, data, state, team, candidates, seed, cache, time_budget):
+        super().__init__("Working ahead", 2 * len(candidates))
+        self.data = data
+        self.state = fork_draft_state(state, log=False)
+        self.team = team
+        self.candidates = list(candidates)
+        self.seed = seed
+        self.cache = cache
+        self.time_budget = time_budget
+        self.pick_idx = state.current_pick_idx
+        self._focus = None
+
+    def focus(self, norm_player):
+        """norm_player was drafted: finish its work, drop the other candidates"""
+        self._focus = norm_player
+        if norm_player not in self.candidates:
+            self.cancel()
+
+    def _wanted(self, norm_player):
+        return not self.cancelled() and self._focus in (None, norm_player)
+
+    def _after_pick(self, norm_player, log=True):
+        state = fork_draft_state(self.state, log=log)
+        manager, round_num, overall_pick = slot_info(self.data.plan, self.pick_idx)
+        row = self.data.pool.iloc[self.data.player_index[norm_player]]
+        record_pick(self.data, state, manager, round_num, overall_pick, row, "Manual pick.")
+        state.current_pick_idx += 1
+        state.pick_number += 1
+        return state
+
+    def work(self):
+        turns = {}
+        for norm_player in self.candidates:
+            if self._wanted(norm_player):
+                picks = PickJob(self.data, self._after_pick(norm_player), {self.team}, cache=self.cache, seed=self.seed)
+                picks.work()   # a cache hit replays instead of simulating, so rebuild the turn from the events
+                if picks.done == picks.total and picks.stop_idx < len(self.data.draft_order):
+                    turn = self._after_pick(norm_player, log=False)
+                    for event in picks.events:
+                        apply_event(self.data, turn, event)
+                    turns[norm_player] = turn
+            self.step()
+        for norm_player in self.candidates:
+            state = turns.get(norm_player)
+            if state is not None and self._wanted(norm_player):
+                key = recommend_key(self.data, state, self.team, self.time_budget)
+                if self.cache.get(key) is None:
+                    results = next_turn_recommendation(
+                        self.data, state, self.team, self.time_budget, lambda: not self._wanted(norm_player)
+                    )
+                    if self._wanted(norm_player):
+                        self.cache.put(key, results)
+            self.step()
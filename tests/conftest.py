@@ -0,0 +1,27 @@
+import glob
+import os
+import shutil
+import sys
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from draft_engine import PLAYER_IDS_FILE, load_data
+
+def copy_inputs(directory):
+    """Copy the repository's input files into directory, which the tests then load from.
+    Loading writes the player id table next to the inputs, so it must not be the checkout."""
+    for path in glob.glob(os.path.join(REPO_DIR, "*.csv")) + glob.glob(os.path.join(REPO_DIR, "*.json")):
+        if os.path.basename(path) != PLAYER_IDS_FILE:
+            shutil.copy(path, directory)
+    return str(directory)
+
+@pytest.fixture(scope="session")
+def input_dir(tmp_path_factory):
+    return copy_inputs(tmp_path_factory.mktemp("inputs"))
+
+@pytest.fixture(scope="session")
+def data(input_dir):
+    """The bundled input files, loaded once per test run"""
+    return load_data(input_dir)
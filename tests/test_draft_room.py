@@ -0,0 +1,41 @@
+# --- DRAFT ROOM: CLAIMS, CHECK-INS AND LEAVING ---
+
+import time
+import draft_room
+from draft_engine import slot_info
+from draft_room import DraftRoom, get_room, leave_room
+
+def test_claims_block_other_sessions_until_they_expire(data):
+    room = DraftRoom(data, "TEST", claim_timeout=0.2)
+    assert room.claim_team("THE K NASTY", "a")
+    assert room.claim_team("THE K NASTY", "a")   # a check-in, or a reload with the same token
+    assert not room.claim_team("THE K NASTY", "b")
+    time.sleep(0.25)
+    assert room.human_teams() == set()
+    assert room.claim_team("THE K NASTY", "b")
+    assert not room.claim_team("THE K NASTY", "a")
+
+def test_release_only_by_the_owner(data):
+    room = DraftRoom(data, "TEST")
+    room.claim_team("THE K NASTY", "a")
+    room.release_team("THE K NASTY", "b")
+    assert room.human_teams() == {"THE K NASTY"}
+    room.release_team("THE K NASTY", "a")
+    assert room.human_teams() == set()
+
+def test_cpu_waits_for_a_live_human_only(data):
+    room = DraftRoom(data, "TEST", claim_timeout=0.2)
+    first = slot_info(data.plan, 0)[0]
+    room.claim_team(first, "a")
+    assert room.sim_next() is None
+    time.sleep(0.25)
+    assert room.sim_next()["pick_idx"] == 0
+
+def test_room_closes_when_the_last_human_leaves(data):
+    room = get_room(data, "leave-test")
+    room.claim_team("THE K NASTY", "a")
+    room.claim_team("LITTLE GIANTS", "b")
+    leave_room(data, "leave-test", "THE K NASTY", "a")
+    assert get_room(data, "leave-test") is room
+    leave_room(data, "leave-test", "LITTLE GIANTS", "b")
+    assert draft_room._room_key(data, "leave-test") not in draft_room._rooms
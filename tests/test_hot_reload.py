@@ -0,0 +1,40 @@
+# --- HOT RELOAD: EDITED RANKING FILES APPLIED TO LOADED DATA ---
+
+import os
+from conftest import copy_inputs
+from draft_engine import ADP_FILE, FRESHMAN_FILE, load_data, normalize_name, refresh_data
+
+def listed(path):
+    with open(path, encoding="utf-8-sig") as f:
+        return {normalize_name(l.split(";")[0]) for l in f.read().splitlines()}
+
+def drop_lines(path, names):
+    with open(path, encoding="utf-8-sig") as f:
+        lines = f.read().splitlines()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(l for l in lines if normalize_name(l.split(";")[0]) not in names) + "\n")
+
+def pick_type(data, name):
+    return data.pool["PickType"].iat[data.player_index[name]]
+
+def test_freshman_listed_only_in_adp_stays_a_freshman(tmp_path):
+    base = copy_inputs(tmp_path)
+    data = load_data(base)
+    freshmen = set(data.pool["NormPlayer"][data.pool["PickType"] == "Freshman"])
+    names = sorted(freshmen & listed(os.path.join(base, ADP_FILE)))[:3]
+    assert names
+    drop_lines(os.path.join(base, FRESHMAN_FILE), names)
+    new, changes = refresh_data(data, base)
+    assert changes
+    assert [pick_type(new, n) for n in names] == ["Freshman"] * len(names)
+
+def test_players_gone_from_the_files_keep_their_row_and_type(tmp_path):
+    base = copy_inputs(tmp_path)
+    data = load_data(base)
+    names = {t: data.pool["NormPlayer"][data.pool["PickType"] == t].iloc[0] for t in ["Freshman", "Upside"]}
+    for name in [FRESHMAN_FILE, ADP_FILE]:
+        drop_lines(os.path.join(base, name), set(names.values()))
+    new, _ = refresh_data(data, base)
+    for t, name in names.items():
+        assert new.player_index[name] == data.player_index[name]
+        assert pick_type(new, name) == t
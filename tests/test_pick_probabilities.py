@@ -0,0 +1,56 @@
+# --- CLOSED-FORM PICK PROBABILITIES AGAINST MONTE CARLO ---
+
+import numpy as np
+import pytest
+from draft_engine import new_draft_state, simulate_next_pick
+from pick_probabilities import availability_at, pick_probability_matrix
+from sim_results import simulate_results, taken_mask
+
+N_SIMS = 1000
+N_PICKS = 6
+
+@pytest.fixture(scope="module", params=[0, 40], ids=["start", "round3"])
+def mid_draft(request, data):
+    state = new_draft_state(data)
+    rng = np.random.RandomState(0)
+    while state.current_pick_idx < request.param:
+        simulate_next_pick(data, state, state.current_pick_idx, explain=False, rng=rng)
+        state.current_pick_idx += 1
+    return state
+
+@pytest.fixture(scope="module")
+def monte_carlo(data, mid_draft):
+    return simulate_results(data, list(range(N_SIMS)), mid_draft, until_idx=mid_draft.current_pick_idx + N_PICKS)
+
+def empirical_matrix(results, pick_indices, n_players):
+    freq = np.zeros((len(pick_indices), n_players))
+    for j, idx in enumerate(pick_indices):
+        picked = results.players[:, idx]
+        freq[j] = np.bincount(picked[picked >= 0], minlength=n_players) / len(picked)
+    return freq
+
+def test_rows_are_distributions(data, mid_draft):
+    pick_indices, matrix = pick_probability_matrix(data, mid_draft, N_PICKS)
+    assert pick_indices == list(range(mid_draft.current_pick_idx, mid_draft.current_pick_idx + N_PICKS))
+    assert (matrix >= 0).all()
+    assert (matrix.sum(axis=1) <= 1 + 1e-9).all()
+    assert not matrix[:, ~mid_draft.available].any()
+    for j, idx in enumerate(pick_indices):
+        if data.plan.manager_ids[idx] < 0:
+            assert not matrix[j].any()
+
+def test_matrix_matches_monte_carlo(data, mid_draft, monte_carlo):
+    pick_indices, matrix = pick_probability_matrix(data, mid_draft, N_PICKS)
+    freq = empirical_matrix(monte_carlo, pick_indices, len(data.pool))
+    # The first pick is enumerated exactly, so only sampling noise separates it from the
+    # simulation; later picks carry the independence approximation as well
+    assert np.abs(matrix[0] - freq[0]).max() < 0.05
+    assert np.abs(matrix - freq).max() < 0.08
+
+def test_availability_matches_monte_carlo(data, mid_draft, monte_carlo):
+    target_idx = mid_draft.current_pick_idx + N_PICKS
+    survival = availability_at(data, mid_draft, target_idx)
+    rows = np.arange(len(data.pool))
+    empirical = (~taken_mask(monte_carlo, rows) & mid_draft.available).mean(axis=0)
+    assert np.abs(survival - empirical).max() < 0.08
+    assert not survival[~mid_draft.available].any()
@@ -0,0 +1,78 @@
+# --- HTTP SERVICE: REQUEST VALIDATION AND ERROR STATUSES ---
+
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from draft_service import DraftService, serve
+
+@pytest.fixture(scope="module")
+def url(input_dir):
+    service = DraftService(input_dir, workers=1)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+def request(url, path, body=None, raw=None):
+    """(status, JSON reply) for a GET, or a POST of body (or of the raw bytes)"""
+    data = raw if raw is not None else None if body is None else json.dumps(body).encode()
+    req = urllib.request.Request(url + path, data, {"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as reply:
+            return reply.status, json.load(reply)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+@pytest.fixture(scope="module")
+def full_draft(url):
+    status, reply = request(url, "/simulate", {"seed": 3})
+    assert status == 200
+    return [p["Player"] if p["Position"] else None for p in reply["drafts"][0]["picks"]]
+
+def test_health(url):
+    status, reply = request(url, "/health")
+    assert status == 200 and reply["status"] == "ok"
+
+def test_simulate_is_seeded(url):
+    first = request(url, "/simulate", {"seed": 1, "until_pick": 10})
+    assert first[0] == 200
+    assert request(url, "/simulate", {"seed": 1, "until_pick": 10}) == first
+
+def test_recommend_after_the_draft(url, full_draft):
+    status, reply = request(url, "/recommend", {"picks": full_draft, "team": "THE K NASTY", "time_budget": 0.2})
+    assert status == 400
+    assert "complete" in reply["error"]
+
+def test_recommend_for_a_team_off_the_clock(url):
+    status, reply = request(url, "/recommend", {"picks": [], "team": "THE K NASTY", "time_budget": 0.2})
+    assert status == 400
+    assert "not on the clock" in reply["error"]
+
+@pytest.mark.parametrize("path, body", [
+    ("/availability", {"picks": [], "at_pick": 10, "players": "Bryce Underwood"}),
+    ("/availability", {"picks": [], "at_pick": 10, "players": [1, 2]}),
+    ("/availability", {"picks": [], "at_pick": 500}),
+    ("/availability", {"picks": [], "at_pick": 10, "method": "bogus"}),
+    ("/availability", {"picks": []}),
+    ("/simulate", {"picks": "Bryce Underwood"}),
+    ("/simulate", {"picks": ["Nobody Real"]}),
+    ("/recommend", {"picks": [], "team": "NOBODY"}),
+])
+def test_bad_requests(url, path, body):
+    status, reply = request(url, path, body)
+    assert status == 400
+    assert reply["error"]
+
+@pytest.mark.parametrize("raw", [b"{not json", b"[1, 2]", b'"text"'])
+def test_malformed_bodies(url, raw):
+    status, reply = request(url, "/simulate", raw=raw)
+    assert status == 400
+    assert reply["error"]
+
+def test_unknown_endpoint(url):
+    assert request(url, "/nope", {})[0] == 404
+    assert request(url, "/nope")[0] == 404
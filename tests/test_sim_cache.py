@@ -0,0 +1,82 @@
+# --- SIM CACHE: MEMORY LRU, DISK STORE, SIZE ACCOUNTING AND EVICTION ---
+
+import os
+import threading
+from sim_cache import SimCache
+
+def disk_usage(cache):
+    return sum(size for _, size, _ in cache._disk_files())
+
+def stray_files(cache):
+    return [name for _, _, files in os.walk(cache.directory) for name in files if not name.endswith(".pkl")]
+
+def key(i):
+    return f"{i:040x}"
+
+def test_memory_lru_and_disk_promotion(tmp_path):
+    cache = SimCache(str(tmp_path), memory_items=2)
+    for i in range(3):
+        cache.put(key(i), i)
+    assert list(cache._memory) == [key(1), key(2)]
+    assert cache.get(key(0)) == 0   # evicted from memory, still on disk
+    assert cache.get(key(0)) == 0
+    assert cache.get(key(99), "missing") == "missing"
+    assert cache.hits == {"memory": 1, "disk": 1, "miss": 1}
+
+def test_get_or_compute_computes_once(tmp_path):
+    cache = SimCache(str(tmp_path))
+    calls = []
+    compute = lambda: calls.append(1) or "value"
+    assert cache.get_or_compute(key(1), compute) == "value"
+    assert cache.get_or_compute(key(1), compute) == "value"
+    assert len(calls) == 1
+
+def test_disk_size_tracks_overwrites(tmp_path):
+    cache = SimCache(str(tmp_path))
+    cache.put(key(1), b"x" * 1000)
+    cache.put(key(2), b"x" * 10)
+    cache.put(key(1), b"x" * 10)    # replacing an entry swaps its size, it does not add to it
+    cache.put(key(2), b"x" * 5000)
+    assert cache._disk_size == disk_usage(cache)
+    assert not stray_files(cache)
+
+def test_disk_size_counts_existing_files(tmp_path):
+    SimCache(str(tmp_path)).put(key(1), b"x" * 1000)
+    cache = SimCache(str(tmp_path))
+    cache.put(key(2), b"x" * 1000)
+    assert cache._disk_size == disk_usage(cache)
+    assert cache.get(key(1)) == b"x" * 1000
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = SimCache(str(tmp_path), memory_items=0, disk_bytes=10_000)
+    for i in range(5):
+        cache.put(key(i), b"x" * 1500)
+        path = cache._path(key(i))
+        os.utime(path, (i, i))   # distinct last-used times, oldest first
+    cache.get(key(0))            # a read counts as a use
+    for i in range(5, 8):
+        cache.put(key(i), b"x" * 1500)
+    assert cache._disk_size == disk_usage(cache) <= cache.disk_bytes
+    assert os.path.exists(cache._path(key(0)))
+    assert not os.path.exists(cache._path(key(1)))
+    assert os.path.exists(cache._path(key(7)))
+
+def test_concurrent_puts_keep_the_size_exact(tmp_path):
+    cache = SimCache(str(tmp_path), memory_items=0, disk_bytes=50_000)
+    def writer(t):
+        for i in range(40):
+            cache.put(key(i % 25), bytes(100 * (t + 1)))
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache._disk_size == disk_usage(cache)
+    assert not stray_files(cache)
+
+def test_clear(tmp_path):
+    cache = SimCache(str(tmp_path))
+    cache.put(key(1), 1)
+    cache.clear()
+    assert cache.get(key(1)) is None
+    assert cache._disk_size == disk_usage(cache) == 0